@@ -0,0 +1,103 @@
+"""
+Cache d'assets borné (LRU) avec comptage mémoire.
+
+Clés : (thème, asset)
+    thème : dossier de thème d'où vient l'image ("default" pour le
+            fallback, None pour les assets hors thème comme le fond)
+    asset : nom de l'image sans extension ("block", "bg_layer1", ...)
+Variantes redimensionnées (transform_cache) : (thème, asset, taille, lissage),
+dans le même cache et le même budget que les sources.
+
+Chaque entrée compte pour la taille de ses pixels (pitch x hauteur). Quand
+le total dépasse le budget, les entrées les moins récemment utilisées sont
+oubliées : un Level en cours garde ses propres références, le cache ne
+fait que ne plus les partager.
+"""
+from collections import OrderedDict
+
+# Budget par défaut : images de plusieurs thèmes et leurs variantes
+DEFAULT_BUDGET_BYTES = 48 * 1024 * 1024
+
+
+def surface_bytes(surface):
+    """Taille réelle des pixels d'une surface (pitch * hauteur)"""
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetCache:
+    """Surfaces partagées entre niveaux, évincées par ancienneté d'usage"""
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        """Présence sans effet sur les statistiques ni l'ordre LRU"""
+        return key in self.entries
+
+    def peek(self, key):
+        """Surface en cache ou None, sans effet sur les statistiques ni l'ordre LRU"""
+        return self.entries.get(key)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Surface en cache (marquée comme récemment utilisée) ou None"""
+        surface = self.entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key, surface):
+        """Ajoute ou remplace une entrée, évince au-delà du budget, retourne surface"""
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= surface_bytes(previous)
+
+        self.entries[key] = surface
+        self.bytes += surface_bytes(surface)
+
+        # L'entrée ajoutée reste même si elle dépasse seule le budget
+        while self.bytes > self.budget_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def get_or_create(self, key, create):
+        """Surface en cache, sinon create() ajoutée au cache"""
+        surface = self.get(key)
+        if surface is None:
+            surface = self.put(key, create())
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Statistiques : entrées, octets, budget, hits, misses, évictions, taux de hit"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __repr__(self):
+        stats = self.stats()
+        return (f"AssetCache({stats['entries']} entrées, {stats['bytes'] / 1024 / 1024:.1f}"
+                f"/{self.budget_bytes / 1024 / 1024:.0f} Mo, hits {stats['hit_rate']:.0%}, "
+                f"{stats['evictions']} évictions)")
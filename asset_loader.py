@@ -0,0 +1,130 @@
+"""
+Chargement des assets en arrière-plan.
+
+Un thread de travail décode les PNG (pygame.image.load) et lit les
+musiques ; le thread principal, seul autorisé à toucher l'écran, fait les
+convert/convert_alpha par petites tranches de temps (pump) entre deux
+frames. La fenêtre et la musique ne sont donc jamais bloquées.
+
+Les images converties vont dans le cache d'assets partagé avec Level
+(asset_cache.AssetCache), sous la clé que Level y cherchera ; les musiques
+lues vont dans MUSIC_CACHE (Level._load_music).
+
+Priorités : PRIORITY_NOW passe devant les préchargements (PRIORITY_PREFETCH)
+encore en attente.
+"""
+import itertools
+import queue
+import threading
+import time
+
+import pygame
+
+# Musiques lues à l'avance : chemin -> octets (les plus récentes seulement)
+MUSIC_CACHE = {}
+MUSIC_CACHE_SIZE = 2
+
+PRIORITY_NOW = 0
+PRIORITY_PREFETCH = 1
+
+
+class LoadJob:
+    """Un lot d'assets demandé au chargeur (suivi de progression)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.total = None  # inconnu tant que le thread n'a pas listé les fichiers
+        self.loaded = 0
+        self.error = None
+
+    @property
+    def done(self):
+        return self.total is not None and self.loaded >= self.total
+
+    @property
+    def progress(self):
+        if self.total is None:
+            return 0.0
+        return 1.0 if self.total == 0 else self.loaded / self.total
+
+
+class AssetLoader:
+    """Décodage dans un thread, conversion sur le thread principal"""
+
+    # Temps maximal de conversion par appel à pump (secondes)
+    CONVERT_BUDGET = 0.004
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.requests = queue.PriorityQueue()
+        self.decoded = queue.Queue()
+        self.order = itertools.count()
+        self.prefetched = set()
+
+        self.thread = threading.Thread(target=self._worker, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def load(self, name, resolve, priority=PRIORITY_NOW):
+        """
+        Demande un lot d'assets. resolve est appelée dans le thread de
+        travail et retourne (images [(clé, chemin, alpha)], musiques [chemin]).
+        """
+        job = LoadJob(name)
+        self.requests.put((priority, next(self.order), job, resolve))
+        return job
+
+    def prefetch(self, name, resolve):
+        """Préchargement (une seule fois par nom), sans priorité"""
+        if name in self.prefetched:
+            return None
+        self.prefetched.add(name)
+        return self.load(name, resolve, PRIORITY_PREFETCH)
+
+    def _worker(self):
+        while True:
+            _, _, job, resolve = self.requests.get()
+            try:
+                images, music = resolve()
+            except Exception as e:
+                job.error = e
+                images, music = [], []
+
+            images = [image for image in images if image[0] not in self.cache]
+            music = [path for path in music if path not in MUSIC_CACHE]
+            job.total = len(images) + len(music)
+
+            for key, path, alpha in images:
+                try:
+                    surface = pygame.image.load(path)
+                except (OSError, pygame.error) as e:
+                    print(f"⚠ Préchargement impossible : {path} ({e})")
+                    surface = None
+                self.decoded.put(("image", (key, alpha), surface, job))
+
+            for path in music:
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError:
+                    data = None
+                self.decoded.put(("music", path, data, job))
+
+    def pump(self, budget=CONVERT_BUDGET):
+        """Convertit les images décodées pendant au plus budget secondes (thread principal)"""
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            try:
+                kind, key, data, job = self.decoded.get_nowait()
+            except queue.Empty:
+                return
+
+            if data is not None:
+                if kind == "image":
+                    key, alpha = key
+                    if key not in self.cache:
+                        self.cache.put(key, data.convert_alpha() if alpha else data.convert())
+                elif kind == "music":
+                    if len(MUSIC_CACHE) >= MUSIC_CACHE_SIZE:
+                        del MUSIC_CACHE[next(iter(MUSIC_CACHE))]
+                    MUSIC_CACHE[key] = data
+            job.loaded += 1
@@ -0,0 +1,110 @@
+"""
+Rendu par zones modifiées (dirty rects) des écrans presque statiques.
+
+La composition statique d'un écran est préparée une fois par compose :
+un fond (background) sous les éléments animés, et des overlays
+(surface, position) dessinés au-dessus d'eux, dans l'ordre (titres,
+footer...). Les overlays sont reblittés tels quels, limités à chaque
+zone, pour un résultat identique à un dessin complet. À chaque frame,
+seules les zones touchées sont recomposées :
+    - les zones des sprites de la frame précédente et de celle-ci
+      (particules du menu),
+    - les widgets dont l'apparence a changé (survol) ou qu'une de ces
+      zones recouvre.
+main.py ne présente ensuite que ces zones (pygame.display.update).
+
+Widgets : objets avec area() (rect couvrant tout leur dessin),
+visual_state() (valeur qui change quand leur apparence change) et
+draw(screen).
+"""
+
+
+def merge_rects(rects):
+    """
+    Regroupe les rects qui se chevauchent en leur union : chaque pixel n'est
+    recomposé qu'une fois (les overlays translucides ne s'accumulent pas).
+    """
+    merged = []
+    for rect in rects:
+        if not rect.w or not rect.h:
+            continue
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRenderer:
+    """Composition en cache et zones à présenter de la frame courante"""
+
+    def __init__(self):
+        self.key = None
+        self.background = None
+        self.overlays = []
+        self.previous = []  # zones des sprites de la frame précédente
+        self.drawn = {}  # id(widget) -> visual_state au dernier dessin
+        self.dirty = None
+
+    def invalidate(self):
+        """L'écran ne correspond plus à la composition (dessin hors renderer)"""
+        self.key = None
+        self.dirty = None
+
+    def render(self, screen, key, compose, sprites, draw_sprites, widgets):
+        """
+        Dessine une frame. compose(screen) -> (background, overlays) n'est
+        appelée que si key change (autre écran, autre page...).
+        sprites : zones des éléments animés de cette frame, dessinés par
+        draw_sprites(screen) entre le fond et les overlays.
+        """
+        screen_rect = screen.get_rect()
+        if key != self.key:
+            self.key = key
+            self.background, self.overlays = compose(screen)
+            self.drawn = {}
+            regions = [screen_rect]
+            redraw = list(widgets)
+        else:
+            regions = merge_rects([rect.clip(screen_rect) for rect in self.previous + sprites])
+            redraw = []
+            pending = list(widgets)
+            changed = True
+            # Une zone agrandie peut en recouvrir un autre widget : jusqu'à stabilité
+            while changed:
+                changed = False
+                for widget in pending[:]:
+                    area = widget.area()
+                    if (self.drawn.get(id(widget)) != widget.visual_state()
+                            or area.collidelist(regions) != -1):
+                        pending.remove(widget)
+                        redraw.append(widget)
+                        regions.append(area.clip(screen_rect))
+                        changed = True
+                regions = merge_rects(regions)
+
+        for rect in regions:
+            screen.blit(self.background, rect, rect)
+        draw_sprites(screen)
+        for surface, pos in self.overlays:
+            overlay_rect = surface.get_rect(topleft=pos)
+            for rect in regions:
+                if overlay_rect.colliderect(rect):
+                    screen.set_clip(rect)
+                    screen.blit(surface, pos)
+        screen.set_clip(None)
+        for widget in redraw:
+            widget.draw(screen)
+            self.drawn[id(widget)] = widget.visual_state()
+
+        self.previous = sprites
+        self.dirty = regions
+
+    def take(self):
+        """Zones à présenter, None si la frame a été dessinée hors renderer (tout l'écran)"""
+        dirty, self.dirty = self.dirty, None
+        if dirty is None:
+            self.key = None
+        return dirty
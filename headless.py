@@ -0,0 +1,79 @@
+"""
+Moteur headless : fait tourner Level et Player sans fenêtre (driver vidéo
+"dummy", pas de convert, pas de musique ni de rendu), aussi vite que le CPU
+le permet, à partir d'une séquence d'entrées scriptée.
+
+Une séquence d'entrées est une fonction tick -> bool (ESPACE enfoncée ou non
+pendant ce pas de simulation). Les scripts de niveaux sont des fichiers JSON :
+    {"sim_hz": 240, "held": [[début, fin], ...]}
+où chaque intervalle [début, fin) donne les ticks pendant lesquels ESPACE
+est maintenue.
+"""
+import os
+import json
+from collections import namedtuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from level import Level
+from asset_cache import AssetCache
+
+SCREEN_SIZE = (1000, 600)
+
+# Résultat d'une tentative simulée
+AttemptResult = namedtuple("AttemptResult", "completed died ticks distance")
+
+
+def load_level(level_path, assets_cache=None, **options):
+    """Crée un Level headless (les options sont passées à Level)"""
+    if assets_cache is None:
+        assets_cache = AssetCache()
+    return Level(level_path, None, assets_cache, *SCREEN_SIZE, headless=True, **options)
+
+
+def max_ticks_for(level):
+    """Nombre de pas au-delà duquel une tentative est considérée bloquée"""
+    seconds = level.level_end_x / level.camera.scroll_speed
+    return int(seconds * 2 * Level.SIM_HZ) + Level.SIM_HZ
+
+
+def script_input(held_ranges):
+    """Séquence d'entrées à partir d'intervalles [début, fin) de ticks"""
+    held = set()
+    for start, end in held_ranges:
+        held.update(range(start, end))
+    return held.__contains__
+
+
+def load_script(path):
+    """Charge un script d'entrées JSON, retourne la séquence d'entrées"""
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("sim_hz", Level.SIM_HZ) != Level.SIM_HZ:
+        raise ValueError(f"{path} : script enregistré à {data['sim_hz']} Hz, simulation à {Level.SIM_HZ} Hz")
+    return script_input(data["held"])
+
+
+def run_attempt(level, is_pressed, max_ticks=None):
+    """
+    Rejoue une tentative depuis le début du niveau. Même ordre que la
+    boucle de main.py : entrée, puis Level.update à pas fixe.
+    """
+    level.reset()
+    if max_ticks is None:
+        max_ticks = max_ticks_for(level)
+
+    player = level.player
+    dt = Level.SIM_DT
+    for tick in range(max_ticks):
+        if is_pressed(tick):
+            player.jump()
+
+        is_dead, is_completed = level.update(dt)
+        if is_dead or is_completed:
+            return AttemptResult(is_completed, is_dead, tick + 1, player.hitbox.x)
+
+    return AttemptResult(False, False, max_ticks, player.hitbox.x)
@@ -1,8 +1,12 @@
 import pygame
+import io
 import json
 import os
+import asset_loader
+import transform_cache
+import level_format
 from player import Player
-from objects import Platform, Spike, DustParticle, Orb, FinishFlag
+from objects import Platform, Spike, DustParticlePool, Orb, FinishFlag
 
 class Camera:
     """Gère le défilement de la caméra avec support pause"""
@@ -10,15 +14,84 @@ class Camera:
         self.scroll_speed = scroll_speed
         self.offset_x = 0.0
         self.is_paused = False
+        
+        # Offset au pas précédent et offset interpolé utilisé pour le dessin
+        self.prev_offset_x = 0.0
+        self.render_offset_x = 0.0
     
     def update(self, dt):
         """Met à jour la position de la caméra (gelée si pause)"""
+        self.prev_offset_x = self.offset_x
         if not self.is_paused:
             self.offset_x += self.scroll_speed * dt
     
+    def reset(self):
+        """Replace la caméra au début du niveau"""
+        self.offset_x = 0.0
+        self.prev_offset_x = 0.0
+        self.render_offset_x = 0.0
+        self.is_paused = False
+    
+    def interpolate(self, alpha):
+        """Calcule l'offset de dessin entre le pas précédent et le pas courant"""
+        self.render_offset_x = self.offset_x * alpha + self.prev_offset_x * (1.0 - alpha)
+    
     def apply(self, rect):
         """Applique l'offset de caméra à un rect pour le dessin"""
-        return rect.move(int(-self.offset_x), 0)
+        return rect.move(int(-self.render_offset_x), 0)
+
+class ColumnIndex:
+    """
+    Index spatial (broad-phase) : range les objets par colonne de tuiles
+    pour ne tester que ceux proches d'un rect au lieu de tout le niveau.
+    """
+    def __init__(self, tile_size):
+        self.tile_size = tile_size
+        self.columns = {}
+    
+    def add(self, obj, rect, order):
+        """
+        Enregistre un objet dans toutes les colonnes couvertes par rect.
+        order : position dans le layout, les requêtes rendent les objets dans
+        cet ordre quel que soit l'ordre de chargement (streaming).
+        """
+        first_col = rect.left // self.tile_size
+        last_col = (rect.right - 1) // self.tile_size
+        
+        entry = (order, obj)
+        for col in range(first_col, last_col + 1):
+            bucket = self.columns.setdefault(col, [])
+            bucket.append(entry)
+            if len(bucket) > 1 and bucket[-2][0] > order:
+                bucket.sort(key=lambda e: e[0])
+    
+    def remove_columns(self, first_col, last_col):
+        """Oublie les objets des colonnes [first_col, last_col)"""
+        for col in range(first_col, last_col):
+            self.columns.pop(col, None)
+    
+    def query(self, rect):
+        """Retourne les objets des colonnes touchées par rect (ordre du layout)"""
+        first_col = rect.left // self.tile_size
+        last_col = (rect.right - 1) // self.tile_size
+        
+        # Cas le plus fréquent : une seule colonne
+        if first_col == last_col:
+            return [obj for _, obj in self.columns.get(first_col, ())]
+        
+        # Plusieurs colonnes dont une seule occupée : pas de fusion à faire
+        columns = self.columns
+        buckets = [columns[col] for col in range(first_col, last_col + 1) if col in columns]
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            return [obj for _, obj in buckets[0]]
+        
+        entries = {}
+        for bucket in buckets:
+            for order, obj in bucket:
+                entries[order] = obj
+        return [entries[order] for order in sorted(entries)]
 
 class Level:
     """
@@ -27,10 +100,33 @@ class Level:
     
     BASE_SCROLL_SPEED = 250.0
     DEATH_ZONE_Y = 1000
+    
+    # Simulation à pas fixe (indépendante du nombre d'images par seconde)
+    SIM_HZ = 240
+    SIM_DT = 1.0 / SIM_HZ
+    
+    # Streaming : au-delà de cette longueur, seules les colonnes proches
+    # de la caméra existent en objets (fenêtre en colonnes devant l'écran)
+    STREAMING_MIN_COLUMNS = 5000
+    STREAM_WINDOW_COLUMNS = 32
+    
+    # Profileur de frame partagé (profiler.FrameProfiler), None = désactivé
+    profiler = None
+    
+    # Images de thème (thème du niveau, sinon default) et layers de parallaxe
+    THEME_IMAGES = ("block", "platform", "spike", "player", "orb")
+    PARALLAX_LAYERS = 2
+    
+    # Clé du fond dans le cache d'assets (chargé par main.py)
+    BACKGROUND_KEY = (None, "background")
 
-    def __init__(self, level_path, bg_image, assets_cache, screen_width, screen_height): 
+    def __init__(self, level_path, bg_image, assets_cache, screen_width, screen_height,
+                 streaming=None, stream_window=STREAM_WINDOW_COLUMNS, headless=False): 
         """
-        Initialise le niveau depuis un fichier JSON avec cache d'assets.
+        Initialise le niveau depuis un fichier JSON avec cache d'assets
+        (asset_cache.AssetCache, partagé entre niveaux).
+        streaming : None = automatique selon la longueur, True/False pour forcer.
+        headless : simulation seule (pas de fenêtre, ni convert, ni musique, ni rendu).
         """
         # Sauvegarde des ressources
         self.level_path = level_path 
@@ -38,6 +134,9 @@ class Level:
         self.assets_cache = assets_cache
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.streaming = streaming
+        self.stream_window = stream_window
+        self.headless = headless
         
         # Création de la caméra
         self.camera = Camera(self.BASE_SCROLL_SPEED)
@@ -49,29 +148,80 @@ class Level:
         self._init_level_content()
         
         # Musique
-        self._load_music()
+        if not self.headless:
+            self._load_music()
+        else:
+            self.music_path = None
         
         # État
         self.is_completed = False
         self.respawn_invincibility = 0.0
         
     def _load_level_data(self):
-        """Charge les données JSON"""
+        """Charge le niveau compilé s'il est à jour, sinon les données JSON"""
+        compiled_path = level_format.compiled_path(self.level_path)
+        if level_format.is_fresh(compiled_path, self.level_path):
+            try:
+                return level_format.load_compiled(compiled_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠ Niveau compilé ignoré : {e}")
+        
         try:
             with open(self.level_path) as f:
-                return json.load(f)
+                data = json.load(f)
         except FileNotFoundError:
             print(f"Erreur : Fichier de niveau introuvable à {self.level_path}")
-            return {"tile_size": 75, "layout": ["========================================"]}
+            data = {"tile_size": 75, "layout": ["========================================"]}
+        
+        data["grid"] = level_format.JsonLayout(data["layout"])
+        return data
+    
+    @staticmethod
+    def music_path_for(level_path):
+        level_name = os.path.basename(level_path).replace(".json", "")
+        return f"assets/music/{level_name}.mp3"
+    
+    @classmethod
+    def asset_paths(cls, level_path):
+        """
+        Images ([(clé du cache d'assets, chemin, alpha)]) et musiques que le
+        Level de ce niveau chargera, pour les précharger (asset_loader).
+        Ne lit que le thème.
+        """
+        compiled_path = level_format.compiled_path(level_path)
+        if level_format.is_fresh(compiled_path, level_path):
+            data = level_format.load_compiled(compiled_path)
+        else:
+            with open(level_path) as f:
+                data = json.load(f)
+        
+        theme_folder = data.get("theme_folder", "default")
+        
+        images = []
+        for name in cls.THEME_IMAGES:
+            for theme in (theme_folder, "default"):
+                path = f"assets/themes/{theme}/{name}.png"
+                if os.path.exists(path):
+                    images.append(((theme, name), path, True))
+                    break
+        for i in range(1, cls.PARALLAX_LAYERS + 1):
+            layer_path = f"assets/themes/{theme_folder}/bg_layer{i}.png"
+            if os.path.exists(layer_path):
+                images.append(((theme_folder, f"bg_layer{i}"), layer_path, True))
+        
+        music_file = cls.music_path_for(level_path)
+        music = [music_file] if os.path.exists(music_file) else []
+        return images, music
     
     def _load_music(self):
-        """Charge la musique du niveau si elle existe"""
+        """Charge la musique du niveau si elle existe (déjà lue si préchargée)"""
         self.music_path = None
         try:
-            level_name = os.path.basename(self.level_path).replace(".json", "")
-            music_file = f"assets/music/{level_name}.mp3"
-            if os.path.exists(music_file):
-                pygame.mixer.music.load(music_file)
+            music_file = self.music_path_for(self.level_path)
+            data = asset_loader.MUSIC_CACHE.get(music_file)
+            if data is not None or os.path.exists(music_file):
+                source = io.BytesIO(data) if data is not None else music_file
+                pygame.mixer.music.load(source, "mp3")
                 pygame.mixer.music.set_volume(0.7)
                 pygame.mixer.music.play(-1)
                 self.music_path = music_file
@@ -89,7 +239,7 @@ class Level:
         data = self.raw_data
         
         self.tile_size = data.get("tile_size", 75)
-        layout = data["layout"]
+        grid = data["grid"]
         
         # Thème du niveau
         self.theme_folder = data.get("theme_folder", "default")
@@ -103,158 +253,335 @@ class Level:
         # Groupes
         self.platforms = pygame.sprite.Group()
         self.spikes = pygame.sprite.Group()
-        self.particles = pygame.sprite.Group()
+        self.particles = DustParticlePool()
         self.orbs = pygame.sprite.Group()  # NOUVEAU
         self.finish_flags = pygame.sprite.Group()  # NOUVEAU
         
+        # Index spatiaux (broad-phase) : plateformes, pics, orbs, flags
+        self.platform_index = ColumnIndex(self.tile_size)
+        self.spike_index = ColumnIndex(self.tile_size)
+        self.orb_index = ColumnIndex(self.tile_size)
+        self.flag_index = ColumnIndex(self.tile_size)
+        
         # Progression
-        self.level_end_x = len(layout[0]) * self.tile_size
+        self.level_end_x = grid.columns * self.tile_size
         self.player_start_x = 100
         
-        # Génération des objets
-        for row_index, row in enumerate(layout):
-            for col_index, char in enumerate(row):
-                world_x = col_index * self.tile_size
-                y = row_index * self.tile_size
-                
-                # DIFFÉRENCIATION SOL vs PLATEFORME
-                if char == "=":
-                    platform = Platform(world_x, y, self.tile_size, self.block_image)
-                    self.platforms.add(platform)
-                    
-                elif char == "P":
-                    platform = Platform(world_x, y, self.tile_size, self.platform_image)
-                    self.platforms.add(platform)
-                    
-                elif char == "S":
-                    spike = Spike(world_x, y + self.tile_size, self.tile_size, self.spike_image)
-                    self.spikes.add(spike)
-                
-                # NOUVEAU : Orb
-                elif char == "O":
-                    orb = Orb(world_x, y, self.tile_size, self.orb_image)
-                    self.orbs.add(orb)
-                
-                # NOUVEAU : Flag de fin
-                elif char == "F":
-                    flag = FinishFlag(world_x, y, self.tile_size)
-                    self.finish_flags.add(flag)
+        # Cache de bandes pré-rendues (tuiles statiques)
+        self._init_tile_chunks(grid.rows, grid.width)
+        
+        # Génération des objets : tout le niveau, ou la fenêtre de streaming
+        self.grid = grid
+        if self.streaming is None:
+            self.streaming = grid.width >= self.STREAMING_MIN_COLUMNS
+        self.stream_chunks = {}
+        self.stream_range = None  # (première, dernière) bande matérialisée
+        if not self.streaming:
+            for char, col_index, row_index in grid.tiles():
+                self._spawn_tile(char, col_index, row_index)
         
         # Joueur
-        self.player = Player(self.player_start_x, 200, self.player_image)
+        self.player = Player(self.player_start_x, 200, self.player_image, headless=self.headless)
         self.respawn_invincibility = 0.5
+        
+        # Snapshot de l'état dynamique de départ (restauré par reset)
+        self.initial_player_state = self.player.get_state()
+        
+        self._update_stream()
+    
+    def _spawn_tile(self, char, col_index, row_index):
+        """Crée l'objet d'un caractère du layout et l'enregistre (groupe + index)"""
+        world_x = col_index * self.tile_size
+        y = row_index * self.tile_size
+        order = row_index * self.grid.width + col_index
+        
+        # DIFFÉRENCIATION SOL vs PLATEFORME
+        if char == "=":
+            platform = Platform(world_x, y, self.tile_size, self.block_image)
+            self.platforms.add(platform)
+            self.platform_index.add(platform, platform.rect, order)
+            return platform
+            
+        elif char == "P":
+            platform = Platform(world_x, y, self.tile_size, self.platform_image)
+            self.platforms.add(platform)
+            self.platform_index.add(platform, platform.rect, order)
+            return platform
+            
+        elif char == "S":
+            spike = Spike(world_x, y + self.tile_size, self.tile_size, self.spike_image)
+            self.spikes.add(spike)
+            self.spike_index.add(spike, spike.hitbox, order)
+            return spike
+        
+        # NOUVEAU : Orb
+        elif char == "O":
+            orb = Orb(world_x, y, self.tile_size, self.orb_image)
+            self.orbs.add(orb)
+            self.orb_index.add(orb, orb.hitbox, order)
+            return orb
+        
+        # NOUVEAU : Flag de fin
+        elif char == "F":
+            flag = FinishFlag(world_x, y, self.tile_size)
+            self.finish_flags.add(flag)
+            self.flag_index.add(flag, flag.rect, order)
+            return flag
+        
+        return None
+    
+    def _update_stream(self):
+        """
+        Streaming : matérialise les bandes de colonnes proches de la caméra
+        (et du joueur) et libère celles qui sont passées derrière. Appelé
+        une fois par pas de simulation (et après reset/set_state) ; ne fait
+        rien tant que la fenêtre de bandes ne change pas.
+        """
+        if not self.streaming:
+            return
+        
+        # Derrière : ni la caméra ni le joueur ne doivent sortir de la fenêtre
+        behind_x = min(self.camera.offset_x, self.player.hitbox.left) - self.tile_size
+        ahead_x = (self.camera.offset_x + self.screen_width
+                   + self.stream_window * self.tile_size)
+        first_chunk = max(0, int(behind_x) // self.chunk_width)
+        # +2 : la bande pré-rendue en avance et sa voisine doivent exister
+        last_chunk = min(int(ahead_x) // self.chunk_width + 2, self.chunk_count - 1)
+        if (first_chunk, last_chunk) == self.stream_range:
+            return
+        self.stream_range = (first_chunk, last_chunk)
+        
+        for chunk_id in [c for c in self.stream_chunks if not first_chunk <= c <= last_chunk]:
+            self._free_stream_chunk(chunk_id)
+        
+        for chunk_id in range(first_chunk, last_chunk + 1):
+            if chunk_id not in self.stream_chunks:
+                self._load_stream_chunk(chunk_id)
+    
+    def _load_stream_chunk(self, chunk_id):
+        """Crée les objets des colonnes d'une bande"""
+        first_col = chunk_id * self.chunk_columns
+        spawned = []
+        for char, col_index, row_index in self.grid.tiles_in_columns(first_col, first_col + self.chunk_columns):
+            obj = self._spawn_tile(char, col_index, row_index)
+            if obj is not None:
+                spawned.append(obj)
+        self.stream_chunks[chunk_id] = spawned
+    
+    def _free_stream_chunk(self, chunk_id):
+        """Libère les objets d'une bande (groupes et index)"""
+        for obj in self.stream_chunks.pop(chunk_id):
+            obj.kill()
+        
+        first_col = chunk_id * self.chunk_columns
+        for index in (self.platform_index, self.spike_index, self.orb_index, self.flag_index):
+            index.remove_columns(first_col, first_col + self.chunk_columns)
+    
+    def _init_tile_chunks(self, rows, columns):
+        """Prépare le cache de bandes de tuiles (une bande ≈ une largeur d'écran)"""
+        self.chunk_columns = max(1, self.screen_width // self.tile_size)
+        self.chunk_width = self.chunk_columns * self.tile_size
+        self.chunk_height = max(self.screen_height, rows * self.tile_size)
+        self.chunk_count = -(-columns // self.chunk_columns)
+        self.tile_chunks = {}
+        
+        # Bandes du point de départ : jamais libérées, le respawn est immédiat
+        self.spawn_chunks = self.screen_width // self.chunk_width + 2
+    
+    def _build_tile_chunk(self, chunk_id):
+        """Compose les plateformes et pics d'une bande sur une seule surface"""
+        left = chunk_id * self.chunk_width
+        chunk = pygame.Surface((self.chunk_width, self.chunk_height), pygame.SRCALPHA)
+        
+        # Marge d'une tuile : une image peut déborder sur la bande voisine
+        area = pygame.Rect(left - self.tile_size, 0,
+                           self.chunk_width + 2 * self.tile_size, self.chunk_height)
+        
+        # Même ordre que l'ancien dessin : plateformes puis pics
+        for platform in self.platform_index.query(area):
+            chunk.blit(platform.image, platform.rect.move(-left, 0))
+        for spike in self.spike_index.query(area):
+            chunk.blit(spike.image, spike.rect.move(-left, 0))
+        
+        return chunk
     
     def _prepare_theme_assets(self):
-        """Charge les images du thème ou fallback sur default"""
-        theme_path = f"assets/themes/{self.theme_folder}"
-        default_path = "assets/themes/default"
+        """Charge les images du thème ou fallback sur default (via le cache d'assets)"""
+        tile = (self.tile_size, self.tile_size)
+        cache = self.assets_cache
         
         # Block (sol)
-        self.block_image = self._load_theme_asset(
-            f"{theme_path}/block.png", 
-            f"{default_path}/block.png"
-        )
-        self.block_image = pygame.transform.scale(self.block_image, (self.tile_size, self.tile_size))
+        block_key, block_img = self._load_theme_asset("block")
+        self.block_image = transform_cache.scale(cache, block_key, block_img, tile)
         
         # Platform (plateformes en l'air)
-        platform_img = self._load_theme_asset(
-            f"{theme_path}/platform.png",
-            f"{default_path}/platform.png"
-        )
+        platform_key, platform_img = self._load_theme_asset("platform")
         # Fallback sur block.png si platform.png manque
         if platform_img is None:
             print(f"⚠ platform.png manquant pour le thème '{self.theme_folder}', fallback sur block.png")
             platform_img = self.block_image
         else:
-            platform_img = pygame.transform.scale(platform_img, (self.tile_size, self.tile_size))
+            platform_img = transform_cache.scale(cache, platform_key, platform_img, tile)
         
         self.platform_image = platform_img
         
         # Spike
-        spike_img = self._load_theme_asset(
-            f"{theme_path}/spike.png",
-            f"{default_path}/spike.png"
-        )
+        spike_key, spike_img = self._load_theme_asset("spike")
         spike_scale = 0.7 * (self.tile_size / spike_img.get_width())
         new_width = int(spike_img.get_width() * spike_scale)
         new_height = int(spike_img.get_height() * spike_scale)
-        self.spike_image = pygame.transform.scale(spike_img, (new_width, new_height))
+        self.spike_image = transform_cache.scale(cache, spike_key, spike_img, (new_width, new_height))
         
-        # Player
-        player_img = self._load_theme_asset(
-            f"{theme_path}/player.png",
-            f"{default_path}/player.png"
-        )
-        self.player_image = player_img
+        # Player (à sa taille de jeu)
+        player_key, player_img = self._load_theme_asset("player")
+        player_size = (player_img.get_width() * Player.IMAGE_SCALE,
+                       player_img.get_height() * Player.IMAGE_SCALE)
+        self.player_image = transform_cache.scale(cache, player_key, player_img, player_size)
         
         # NOUVEAU : Orb
-        orb_img = self._load_theme_asset(
-            f"{theme_path}/orb.png",
-            f"{default_path}/orb.png"
-        )
+        orb_size = int(self.tile_size * Orb.SIZE_RATIO)
+        orb_key, orb_img = self._load_theme_asset("orb")
         if orb_img is None:
             # Fallback : créer un cercle jaune
-            orb_img = pygame.Surface((int(self.tile_size*0.6), int(self.tile_size*0.6)), pygame.SRCALPHA)
+            orb_img = pygame.Surface((orb_size, orb_size), pygame.SRCALPHA)
             pygame.draw.circle(orb_img, (255, 200, 0), orb_img.get_rect().center, orb_img.get_width()//2)
         
-        self.orb_image = orb_img
+        self.orb_image = transform_cache.scale(cache, orb_key, orb_img, (orb_size, orb_size))
         
-        # Background layers parallaxe
+        # Background layers parallaxe (mis à l'échelle par le cache de rendu)
         self.parallax_layers = []
-        for i in range(1, 3):
-            layer_path = f"{theme_path}/bg_layer{i}.png"
-            layer_img = self._load_theme_asset(layer_path, None)
+        self.render_cache_size = None
+        self.render_cache = {}
+        if self.headless:
+            return
+        
+        for i in range(1, self.PARALLAX_LAYERS + 1):
+            layer_key, layer_img = self._load_theme_asset(f"bg_layer{i}", use_fallback=False)
             if layer_img:
-                layer_img = pygame.transform.scale(layer_img, (self.screen_width, self.screen_height))
-                self.parallax_layers.append(layer_img)
-    
-    def _load_theme_asset(self, primary_path, fallback_path):
-        """Charge un asset avec fallback"""
-        cache_key = f"theme_{self.theme_folder}_{os.path.basename(primary_path)}"
-        if cache_key in self.assets_cache:
-            return self.assets_cache[cache_key]
-        
-        img = None
-        if os.path.exists(primary_path):
-            img = pygame.image.load(primary_path).convert_alpha()
-        elif fallback_path and os.path.exists(fallback_path):
-            img = pygame.image.load(fallback_path).convert_alpha()
-        else:
-            # Fallback ultime
-            img = pygame.Surface((50, 50), pygame.SRCALPHA)
-            img.fill((100, 100, 100))
+                self.parallax_layers.append((layer_key, layer_img))
         
-        self.assets_cache[cache_key] = img
-        return img
+        # Cache de rendu par taille d'écran, préparé pour la taille de départ
+        self._get_render_cache((self.screen_width, self.screen_height))
+    
+    def _get_render_cache(self, size):
+        """
+        Fond et layers de parallaxe à la taille de l'écran. Recalculés
+        uniquement quand la taille change (redimensionnement, plein écran) ;
+        les variantes sont partagées entre niveaux par le cache d'assets.
+        """
+        if size != self.render_cache_size:
+            self.render_cache_size = size
+            cache = self.assets_cache
+            self.render_cache = {
+                "background": transform_cache.scale(cache, self.BACKGROUND_KEY, self.bg_image, size),
+                "parallax": [transform_cache.scale(cache, key, layer, size)
+                             for key, layer in self.parallax_layers],
+            }
+        return self.render_cache
+    
+    def _load_theme_asset(self, asset, use_fallback=True):
+        """
+        (clé dans le cache d'assets, image) d'un asset du thème, sinon du
+        thème default ; (None, None) si introuvable sans fallback, clé None
+        pour l'image de secours générée.
+        """
+        themes = [self.theme_folder]
+        if use_fallback and self.theme_folder != "default":
+            themes.append("default")
+        
+        for theme in themes:
+            key = (theme, asset)
+            img = self.assets_cache.get(key)
+            if img is not None:
+                return key, img
+            
+            path = f"assets/themes/{theme}/{asset}.png"
+            if os.path.exists(path):
+                return key, self.assets_cache.put(key, self._load_image(path))
+        
+        if not use_fallback:
+            return None, None
+        
+        # Fallback ultime
+        img = pygame.Surface((50, 50), pygame.SRCALPHA)
+        img.fill((100, 100, 100))
+        return None, img
+    
+    def _load_image(self, path):
+        """Charge une image (convert_alpha seulement si une fenêtre existe)"""
+        img = pygame.image.load(path)
+        return img if self.headless else img.convert_alpha()
     
     def reset(self):
-        """RESET PROPRE"""
+        """
+        RESET INCRÉMENTAL : le monde statique (tuiles, index, bandes, thème)
+        est conservé, seul l'état dynamique est restauré depuis le snapshot.
+        """
         self.stop_music()
         
-        self.platforms.empty()
-        self.spikes.empty()
-        self.particles.empty()
-        self.orbs.empty()  # NOUVEAU
-        self.finish_flags.empty()  # NOUVEAU
+        self.particles.clear()
+        for orb in self.orbs:
+            orb.reset()
         
-        self.camera.offset_x = 0.0
-        self.camera.is_paused = False
+        self.camera.reset()
         
-        self._init_level_content()
+        self.player.set_state(self.initial_player_state)
+        self.respawn_invincibility = 0.5
         self.is_completed = False
+        
+        self._update_stream()
+    
+    def get_state(self):
+        """
+        Copie de l'état de simulation (caméra, joueur, orbs collectées...),
+        pour explorer plusieurs suites d'entrées depuis un même point.
+        L'animation des orbs et les particules, purement visuelles, n'en font pas partie.
+        """
+        return {
+            "camera": (self.camera.offset_x, self.camera.prev_offset_x, self.camera.is_paused),
+            "player": self.player.get_state(),
+            "collected_orbs": [orb for orb in self.orbs if orb.collected],
+            "respawn_invincibility": self.respawn_invincibility,
+            "is_completed": self.is_completed,
+        }
+    
+    def set_state(self, state):
+        """Restaure un état obtenu par get_state"""
+        self.camera.offset_x, self.camera.prev_offset_x, self.camera.is_paused = state["camera"]
+        self.player.set_state(state["player"])
+        
+        collected = state["collected_orbs"]
+        for orb in self.orbs:
+            orb.collected = False
+        for orb in collected:
+            orb.collected = True
+        
+        self.respawn_invincibility = state["respawn_invincibility"]
+        self.is_completed = state["is_completed"]
+        self._update_stream()
     
     def update(self, dt):
-        """Met à jour tous les éléments"""
-        dt = min(dt, 0.016)
+        """
+        Met à jour tous les éléments d'un pas de simulation. dt vaut toujours
+        SIM_DT (seul endroit où le pas est défini) : c'est la boucle à
+        accumulateur de main.py qui rattrape le temps écoulé.
+        """
+        prof = self.profiler
+        if prof is not None:
+            prof.mark()
         
         self.camera.update(dt)
+        self._update_stream()
         
         if self.respawn_invincibility > 0:
             self.respawn_invincibility = max(0, self.respawn_invincibility - dt)
         
         # Update joueur
         was_on_ground = not self.player.is_jumping
-        player_died = self.player.update(self.platforms, dt, self.camera) 
+        player_died = self.player.update(self.platform_index, dt, self.camera) 
+        
+        if prof is not None:
+            prof.lap("physics")
         
         if player_died:
             return (True, False)
@@ -263,29 +590,36 @@ class Level:
         if self.player.hitbox.top > self.DEATH_ZONE_Y:
             return (True, False)
         
-        # Particules si atterrissage
-        is_now_on_ground = not self.player.is_jumping
-        if not was_on_ground and is_now_on_ground:
-            for _ in range(8):
-                particle = DustParticle(self.player.hitbox.centerx, self.player.hitbox.bottom)
-                self.particles.add(particle)
+        # Particules si atterrissage (purement visuelles : rien en headless)
+        if not self.headless:
+            is_now_on_ground = not self.player.is_jumping
+            if not was_on_ground and is_now_on_ground:
+                self.particles.emit(self.player.hitbox.centerx, self.player.hitbox.bottom, 8)
+            
+            # Update particules
+            self.particles.update(dt)
+            
+            if prof is not None:
+                prof.lap("particles")
         
-        # Update particules
-        self.particles.update(dt)
+        # Update orbs (flottement purement visuel : rien en headless)
+        if not self.headless:
+            for orb in self.orbs:
+                orb.update(dt)
         
-        # Update orbs
-        for orb in self.orbs:
-            orb.update(dt)
-        
-        # Collisions avec orbs
-        for orb in self.orbs:
+        # Collisions avec orbs (seulement les candidats proches)
+        for orb in self.orb_index.query(self.player.hitbox):
             if not orb.collected and self.player.hitbox.colliderect(orb.hitbox):
                 orb.collect()
                 self.player.collect_orb()
-                print("✨ Double saut activé!")
+                if not self.headless:
+                    print("✨ Double saut activé!")
+        
+        if prof is not None:
+            prof.lap("orbs")
         
         # Vérifier flag de fin
-        for flag in self.finish_flags:
+        for flag in self.flag_index.query(self.player.hitbox):
             if self.player.hitbox.colliderect(flag.rect):
                 self.is_completed = True
                 self.camera.is_paused = True
@@ -293,54 +627,96 @@ class Level:
                 return (False, True)
         
         # Collisions spikes
+        hit_spike = False
         if self.respawn_invincibility <= 0:
-            for spike in self.spikes:
+            for spike in self.spike_index.query(self.player.hitbox):
                 if self.player.hitbox.colliderect(spike.hitbox):
-                    return (True, False)
+                    hit_spike = True
+                    break
         
-        return (False, False)
+        if prof is not None:
+            prof.lap("spikes")
+        
+        return (hit_spike, False)
     
     def get_progress_data(self):
         return self.camera.offset_x, self.level_end_x, self.player_start_x
     
-    def draw(self, screen, screen_width):
-        """Affiche avec parallaxe et culling"""
-        # Fond
-        bg_scaled = pygame.transform.scale(self.bg_image, screen.get_size())
-        screen.blit(bg_scaled, (0, 0))
+    def draw(self, screen, screen_width, alpha=1.0):
+        """
+        Affiche avec parallaxe et culling.
+        alpha : fraction du pas de simulation écoulée (rendu interpolé).
+        """
+        prof = self.profiler
+        if prof is not None:
+            prof.mark()
+        
+        self.camera.interpolate(alpha)
+        
+        # Fond (mis à l'échelle une seule fois par taille d'écran)
+        render_cache = self._get_render_cache(screen.get_size())
+        screen.blit(render_cache["background"], (0, 0))
+        if prof is not None:
+            prof.lap("background")
         
         # Parallaxe
-        self._draw_parallax(screen, screen_width)
+        self._draw_parallax(screen, screen_width, render_cache["parallax"])
+        if prof is not None:
+            prof.lap("parallax")
+        
+        # Tuiles statiques (bandes pré-rendues)
+        self._draw_tile_chunks(screen, screen_width)
+        if prof is not None:
+            prof.lap("tiles")
         
         # Culling zone
-        visible_left = self.camera.offset_x - 100
-        visible_right = self.camera.offset_x + screen_width + 100
+        visible_left = self.camera.render_offset_x - 100
+        visible_right = self.camera.render_offset_x + screen_width + 100
+        visible_area = pygame.Rect(int(visible_left), 0, int(visible_right - visible_left), 1)
         
         # Dessin objets
-        for platform in self.platforms:
-            if platform.rect.right > visible_left and platform.rect.left < visible_right:
-                screen.blit(platform.image, self.camera.apply(platform.rect))
-        
-        for spike in self.spikes:
-            if spike.rect.right > visible_left and spike.rect.left < visible_right:
-                spike.draw(screen, self.camera)
-        
-        for orb in self.orbs:
+        for orb in self.orb_index.query(visible_area):
             if not orb.collected:
                 orb.draw(screen, self.camera)
         
-        for particle in self.particles:
-            if particle.rect.right > visible_left and platform.rect.left < visible_right:
-                particle.draw(screen, self.camera)
+        self.particles.draw(screen, self.camera, visible_left, visible_right)
+        if prof is not None:
+            prof.lap("sprites")
         
         # Joueur
-        self.player.draw(screen, self.camera, self.respawn_invincibility > 0)
+        self.player.draw(screen, self.camera, self.respawn_invincibility > 0, alpha)
+        if prof is not None:
+            prof.lap("player")
+    
+    def _draw_tile_chunks(self, screen, screen_width):
+        """
+        Dessine les bandes visibles, prépare la suivante et libère celles
+        passées. Les objets de ces bandes sont déjà matérialisés par le
+        streaming de update (fenêtre en avance de plusieurs bandes).
+        """
+        first_chunk = int(self.camera.render_offset_x) // self.chunk_width
+        last_chunk = int(self.camera.render_offset_x + screen_width) // self.chunk_width
+        
+        # Éviction derrière la caméra (sauf bandes de départ)
+        for chunk_id in [c for c in self.tile_chunks if self.spawn_chunks <= c < first_chunk]:
+            del self.tile_chunks[chunk_id]
+        
+        # +1 : la bande suivante est construite en avance
+        for chunk_id in range(max(0, first_chunk), min(last_chunk + 2, self.chunk_count)):
+            chunk = self.tile_chunks.get(chunk_id)
+            if chunk is None:
+                chunk = self._build_tile_chunk(chunk_id)
+                self.tile_chunks[chunk_id] = chunk
+            
+            if chunk_id <= last_chunk:
+                chunk_rect = chunk.get_rect(topleft=(chunk_id * self.chunk_width, 0))
+                screen.blit(chunk, self.camera.apply(chunk_rect))
     
-    def _draw_parallax(self, screen, screen_width):
+    def _draw_parallax(self, screen, screen_width, layers):
         """Dessine les layers de parallaxe"""
-        for i, layer in enumerate(self.parallax_layers):
+        for i, layer in enumerate(layers):
             speed = 0.3 * (i + 1)
-            offset = int(self.camera.offset_x * speed)
+            offset = int(self.camera.render_offset_x * speed)
             
             # Tiling infini
             screen.blit(layer, (-offset % screen_width - screen_width, 0))
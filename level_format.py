@@ -0,0 +1,173 @@
+"""
+Format de niveau compilé (.gdl) : un en-tête puis des tableaux typés.
+
+    en-tête   : magic, version, tile_size, rows, columns, width, count, taille méta
+    méta      : JSON utf-8 (theme_folder, parallax_speed, ...), sans le layout
+    row_starts: uint32[rows + 1]  -> objets de la ligne r = [row_starts[r], row_starts[r+1])
+    cols      : uint32[count]     -> colonne de chaque objet (croissante dans une ligne)
+    kinds     : uint8[count]      -> caractère du layout ("=", "P", "S", "O", "F")
+
+Les objets sont rangés ligne par ligne, dans le même ordre que le parcours
+du layout JSON. Le chargement ne fait aucune boucle par caractère.
+"""
+import json
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"GDLV"
+VERSION = 1
+COMPILED_EXTENSION = ".gdl"
+
+# Caractères du layout qui créent un objet
+TILE_KINDS = "=PSOF"
+
+_HEADER = struct.Struct("<4sHHIIIII")
+
+
+class JsonLayout:
+    """Layout ASCII du JSON (liste de chaînes)"""
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.rows = len(layout)
+        self.columns = len(layout[0])
+        self.width = max(len(row) for row in layout)
+
+    def tiles(self):
+        """Itère sur (caractère, colonne, ligne) des objets, ligne par ligne"""
+        for row_index, row in enumerate(self.layout):
+            for col_index, char in enumerate(row):
+                if char in TILE_KINDS:
+                    yield char, col_index, row_index
+
+    def tiles_in_columns(self, first_col, last_col):
+        """Comme tiles(), limité aux colonnes [first_col, last_col)"""
+        for row_index, row in enumerate(self.layout):
+            for col_index, char in enumerate(row[first_col:last_col], first_col):
+                if char in TILE_KINDS:
+                    yield char, col_index, row_index
+
+
+class CompiledLayout:
+    """Layout chargé depuis un fichier compilé (tableaux typés)"""
+
+    def __init__(self, rows, columns, width, row_starts, cols, kinds):
+        self.rows = rows
+        self.columns = columns
+        self.width = width
+        self.row_starts = row_starts
+        self.cols = cols
+        self.kinds = kinds
+
+    def tiles(self):
+        """Itère sur (caractère, colonne, ligne) des objets, ligne par ligne"""
+        kinds = self.kinds.decode("ascii")
+        for row_index in range(self.rows):
+            for i in range(self.row_starts[row_index], self.row_starts[row_index + 1]):
+                yield kinds[i], self.cols[i], row_index
+
+    def tiles_in_columns(self, first_col, last_col):
+        """Comme tiles(), limité aux colonnes [first_col, last_col) (recherche par ligne)"""
+        kinds = self.kinds
+        for row_index in range(self.rows):
+            start = self.row_starts[row_index]
+            end = self.row_starts[row_index + 1]
+            i = bisect_left(self.cols, first_col, start, end)
+            while i < end and self.cols[i] < last_col:
+                yield chr(kinds[i]), self.cols[i], row_index
+                i += 1
+
+
+def compiled_path(level_path):
+    """Chemin du fichier compilé associé à un levelN.json"""
+    return os.path.splitext(level_path)[0] + COMPILED_EXTENSION
+
+
+def is_fresh(compiled, source):
+    """Vrai si le fichier compilé existe et n'est pas plus vieux que le JSON"""
+    if not os.path.exists(compiled):
+        return False
+    if not os.path.exists(source):
+        return True
+    return os.path.getmtime(compiled) >= os.path.getmtime(source)
+
+
+def _uint32_array(data):
+    values = array("I")
+    if values.itemsize != 4:
+        values = array("L")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def compile_level(source, destination=None):
+    """Compile un levelN.json en levelN.gdl, retourne le chemin écrit"""
+    with open(source) as f:
+        data = json.load(f)
+
+    grid = JsonLayout(data["layout"])
+    meta = {key: value for key, value in data.items() if key not in ("layout", "tile_size")}
+
+    row_starts = [0] * (grid.rows + 1)
+    cols = []
+    kinds = bytearray()
+    for char, col, row in grid.tiles():
+        cols.append(col)
+        kinds.append(ord(char))
+        row_starts[row + 1] += 1
+    for row in range(grid.rows):
+        row_starts[row + 1] += row_starts[row]
+
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    # Alignement sur 4 octets pour les tableaux uint32
+    meta_bytes += b" " * (-(len(meta_bytes) + _HEADER.size) % 4)
+
+    destination = destination or compiled_path(source)
+    with open(destination, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, data.get("tile_size", 75),
+                             grid.rows, grid.columns, grid.width,
+                             len(cols), len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(struct.pack(f"<{len(row_starts)}I", *row_starts))
+        f.write(struct.pack(f"<{len(cols)}I", *cols))
+        f.write(kinds)
+    return destination
+
+
+def load_compiled(path):
+    """
+    Charge un fichier compilé et retourne les données du niveau
+    (mêmes clés que le JSON, avec "grid" à la place de "layout").
+    Lève ValueError si le fichier est invalide ou d'une autre version.
+    """
+    with open(path, "rb") as f:
+        buffer = memoryview(f.read())
+
+    if len(buffer) < _HEADER.size:
+        raise ValueError(f"{path} : fichier tronqué")
+    magic, version, tile_size, rows, columns, width, count, meta_len = _HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} : format {magic!r} v{version} non supporté")
+
+    offset = _HEADER.size
+    data = json.loads(bytes(buffer[offset:offset + meta_len]).decode("utf-8"))
+    offset += meta_len
+
+    sizes = (4 * (rows + 1), 4 * count, count)
+    if len(buffer) != offset + sum(sizes):
+        raise ValueError(f"{path} : taille incohérente")
+
+    row_starts = _uint32_array(buffer[offset:offset + sizes[0]])
+    offset += sizes[0]
+    cols = _uint32_array(buffer[offset:offset + sizes[1]])
+    offset += sizes[1]
+    kinds = bytes(buffer[offset:offset + sizes[2]])
+
+    data["tile_size"] = tile_size
+    data["grid"] = CompiledLayout(rows, columns, width, row_starts, cols, kinds)
+    return data
@@ -2,6 +2,7 @@ import pygame
 import os
 import sys
 import random
+import time
 
 # ============================================
 # 1. INITIALISATION PYGAME - DOIT ÊTRE EN PREMIER
@@ -25,10 +26,37 @@ clock = pygame.time.Clock()
 # 4. IMPORT DU RESTE (après initialisation pygame)
 # ============================================
 from level import Level
-from menu import draw_menu, draw_pause_menu, draw_level_select
-
-# Cache global d'assets pour optimisation
-ASSETS_CACHE = {}
+from menu import (draw_menu, draw_pause_menu, draw_level_select, draw_loading_screen, change_level_page,
+                  get_menu_manager, take_dirty_rects, invalidate_screen)
+from asset_loader import AssetLoader
+from asset_cache import AssetCache
+from text_cache import render
+from profiler import FrameProfiler
+from replay import Replay, ReplayRecorder, level_crc, final_state
+
+# Cache global d'assets (LRU borné, clés (thème, asset), voir asset_cache.py)
+ASSETS_CACHE = AssetCache()
+
+# Boucle à pas fixe : la simulation avance par pas de Level.SIM_DT,
+# l'affichage est limité à FPS et interpolé entre deux pas
+FPS = 60
+MAX_FRAME_TIME = 0.25  # au-delà, on ralentit plutôt que d'enchaîner trop de pas
+
+# Profileur de frame : F3 affiche/masque, F4 démarre/arrête une trace
+PROFILER = FrameProfiler()
+PROFILER_KEY = pygame.K_F3
+TRACE_KEY = pygame.K_F4
+TRACE_EXTENSION = ".csv"  # ".json" pour une trace JSON
+
+# Chargement en arrière-plan (voir asset_loader.py) : conversions limitées
+# à CONVERT_BUDGET par frame dans les menus, plus sur l'écran de chargement
+LOADER = AssetLoader(ASSETS_CACHE)
+LOADING_CONVERT_BUDGET = 0.010
+PREFETCH_NEIGHBOURS = 1  # niveaux préchargés de part et d'autre du dernier choisi
+
+# Chaque tentative est enregistrée dans replays/ (voir replay.py) ;
+# "python main.py --replay fichier.gdr" rejoue une tentative enregistrée
+RECORDER = ReplayRecorder(os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays"))
 
 # ============================================
 # GAME STATE
@@ -40,6 +68,8 @@ class GameState:
         self.selected_level = None
         self.running = True
         self.attempts = 0
+        self.tick = 0  # pas de simulation de la tentative en cours
+        self.confetti = ()  # confettis de la dernière victoire (x, y, taille)
 
     def change(self, new):
         self.state = new
@@ -50,48 +80,119 @@ GAME_STATE = GameState()
 # ÉCRAN DE VICTOIRE PREMIUM
 # ============================================
 
-def draw_victory_screen(screen, attempts, tile_size):
-    """Écran de victoire avec animations"""
-    screen.fill((10, 10, 30))
-    
-    # Particules de célébration
+class VictoryButton:
+    """Bouton de l'écran de victoire (widget du rendu par zones, voir dirty_renderer.py)"""
+
+    def __init__(self, x, y, w, h, text):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.text = text
+        self.hovered = False
+
+    def area(self):
+        return self.rect
+
+    def visual_state(self):
+        return self.hovered
+
+    def draw(self, screen):
+        color = (0, 200, 255) if self.hovered else (100, 100, 120)
+        pygame.draw.rect(screen, color, self.rect, border_radius=15)
+        txt = render(self.text, 28, (255, 255, 255), bold=True)
+        screen.blit(txt, txt.get_rect(center=self.rect.center))
+
+VICTORY_BUTTONS = {
+    "menu": VictoryButton(WIDTH//2 - 150, HEIGHT//2 + 80, 140, 50, "MENU"),
+    "retry": VictoryButton(WIDTH//2 + 10, HEIGHT//2 + 80, 140, 50, "REJOUER"),
+}
+
+def new_victory_confetti():
+    """Confettis tirés une fois par victoire (fixes tant que l'écran reste affiché)"""
+    confetti = []
     for _ in range(30):
         x = random.randint(0, WIDTH)
         y = random.randint(0, HEIGHT)
         size = random.randint(3, 6)
-        pygame.draw.circle(screen, (255, 215, 0), (x, y), size)
+        confetti.append((x, y, size))
+    return tuple(confetti)
+
+def compose_victory(attempts, confetti):
+    """Partie statique de l'écran de victoire : fond, confettis, titre et statistiques"""
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill((10, 10, 30))
+    
+    # Particules de célébration
+    for x, y, size in confetti:
+        pygame.draw.circle(background, (255, 215, 0), (x, y), size)
     
     # Titre principal
-    title_font = pygame.font.SysFont("Arial", 72, bold=True)
-    title = title_font.render("VICTORY!", True, (255, 215, 0))
+    title = render("VICTORY!", 72, (255, 215, 0), bold=True)
     title_rect = title.get_rect(center=(WIDTH//2, HEIGHT//2 - 100))
-    screen.blit(title, title_rect)
     
     # Statistiques
-    stats_font = pygame.font.SysFont("Arial", 36)
-    stats = stats_font.render(f"Terminé en {attempts} tentatives", True, (255, 255, 255))
+    stats = render(f"Terminé en {attempts} tentatives", 36, (255, 255, 255))
     stats_rect = stats.get_rect(center=(WIDTH//2, HEIGHT//2))
-    screen.blit(stats, stats_rect)
     
-    # Boutons
-    btn_font = pygame.font.SysFont("Arial", 28, bold=True)
-    menu_btn = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 + 80, 140, 50)
-    retry_btn = pygame.Rect(WIDTH//2 + 10, HEIGHT//2 + 80, 140, 50)
-    
-    # Dessiner boutons avec hover
+    return background, [(title, title_rect.topleft), (stats, stats_rect.topleft)]
+
+def draw_victory_screen(screen, attempts, tile_size):
+    """Écran de victoire (seuls les boutons dont le survol change sont redessinés)"""
+    # Boutons avec hover
     mouse_pos = pygame.mouse.get_pos()
-    for btn, text in [(menu_btn, "MENU"), (retry_btn, "REJOUER")]:
-        color = (0, 200, 255) if btn.collidepoint(mouse_pos) else (100, 100, 120)
-        pygame.draw.rect(screen, color, btn, border_radius=15)
-        txt = btn_font.render(text, True, (255, 255, 255))
-        screen.blit(txt, txt.get_rect(center=btn.center))
+    for btn in VICTORY_BUTTONS.values():
+        btn.hovered = btn.rect.collidepoint(mouse_pos)
+    
+    # Confettis fixes : composés avec le fond, une fois par victoire
+    confetti = GAME_STATE.confetti
+    get_menu_manager(screen).renderer.render(screen, ("VICTORY", attempts, confetti),
+                                             lambda screen: compose_victory(attempts, confetti),
+                                             [], lambda screen: None, VICTORY_BUTTONS.values())
     
-    return {"menu": menu_btn, "retry": retry_btn}
+    return {key: btn.rect for key, btn in VICTORY_BUTTONS.items()}
 
 # ============================================
 # CHARGEMENT ASSETS
 # ============================================
 
+def wait_for(job):
+    """Écran de chargement jusqu'à la fin d'un lot (la fenêtre reste réactive)"""
+    while not job.done:
+        clock.tick(FPS)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        LOADER.pump(LOADING_CONVERT_BUDGET)
+        draw_loading_screen(screen, pygame.mouse.get_pos(), job.progress, job.name)
+        pygame.display.flip()
+    # Le temps de chargement ne compte pas comme temps de jeu
+    clock.tick()
+
+# Assets de main.py dans le cache d'assets : nom -> (clé, chemin relatif à assets/, alpha)
+STARTUP_ASSETS = {
+    "background": (Level.BACKGROUND_KEY, "background.png", False),
+    "player_cube": ((None, "cube"), "cube.png", True),
+    "block_default": (("default", "block"), os.path.join("themes", "default", "block.png"), True),
+    "spike_default": (("default", "spike"), os.path.join("themes", "default", "spike.png"), True),
+}
+
+def load_image(name, path):
+    """Image préchargée par LOADER si possible, sinon chargée ici"""
+    key, _, alpha = STARTUP_ASSETS[name]
+    img = ASSETS_CACHE.get(key)
+    if img is None:
+        img = pygame.image.load(path)
+        img = ASSETS_CACHE.put(key, img.convert_alpha() if alpha else img.convert())
+    return img
+
+def level_assets(lvl_path):
+    """Lot d'assets d'un niveau (résolu dans le thread de chargement)"""
+    return lambda: Level.asset_paths(lvl_path)
+
+def startup_assets():
+    assets_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+    images = [(key, os.path.join(assets_dir, path), alpha) for key, path, alpha in STARTUP_ASSETS.values()]
+    return [image for image in images if os.path.exists(image[1])], []
+
 def load_assets():
     assets = {}
     SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -104,7 +205,7 @@ def load_assets():
         # Background de secours
         bg_path = os.path.join(ASSETS_DIR, "background.png")
         if os.path.exists(bg_path):
-            assets["background"] = pygame.image.load(bg_path).convert()
+            assets["background"] = load_image("background", bg_path)
             print("✅ background.png")
         else:
             print("❌ background.png manquant")
@@ -112,7 +213,7 @@ def load_assets():
         # Joueur de secours
         player_path = os.path.join(ASSETS_DIR, "cube.png")
         if os.path.exists(player_path):
-            assets["player_cube"] = pygame.image.load(player_path).convert_alpha()
+            assets["player_cube"] = load_image("player_cube", player_path)
             print("✅ cube.png")
         else:
             print("❌ cube.png manquant")
@@ -120,14 +221,14 @@ def load_assets():
         # Assets theme default
         block_path = os.path.join(ASSETS_DIR, "themes", "default", "block.png")
         if os.path.exists(block_path):
-            assets["block_default"] = pygame.image.load(block_path).convert_alpha()
+            assets["block_default"] = load_image("block_default", block_path)
             print("✅ themes/default/block.png")
         else:
             print("❌ block.png manquant")
             
         spike_path = os.path.join(ASSETS_DIR, "themes", "default", "spike.png")
         if os.path.exists(spike_path):
-            assets["spike_default"] = pygame.image.load(spike_path).convert_alpha()
+            assets["spike_default"] = load_image("spike_default", spike_path)
             print("✅ themes/default/spike.png")
         else:
             print("❌ spike.png manquant")
@@ -158,6 +259,7 @@ def load_assets():
     
     return assets
 
+wait_for(LOADER.load("Assets", startup_assets))
 ASSETS = load_assets()
 
 # ============================================
@@ -186,15 +288,93 @@ DEFAULT_LEVEL = AVAILABLE_LEVELS[0] if AVAILABLE_LEVELS else "level1.json"
 # Charger premier niveau
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 level_path = os.path.join(SCRIPT_DIR, "levels", DEFAULT_LEVEL)
+wait_for(LOADER.load(DEFAULT_LEVEL, level_assets(level_path)))
 level = Level(level_path, ASSETS["background"], ASSETS_CACHE, WIDTH, HEIGHT)
 
+# ============================================
+# REPLAY
+# ============================================
+
+REPLAY = None
+REPLAY_INPUT = None
+
+if "--replay" in sys.argv[1:-1]:
+    replay_path = sys.argv[sys.argv.index("--replay") + 1]
+    REPLAY = Replay.load(replay_path)
+    REPLAY_INPUT = REPLAY.input_sequence()
+    
+    level_path = os.path.join(SCRIPT_DIR, "levels", REPLAY.level_name)
+    if level_crc(level_path) != REPLAY.crc:
+        print(f"⚠ {REPLAY.level_name} a changé depuis l'enregistrement du replay")
+    wait_for(LOADER.load(REPLAY.level_name, level_assets(level_path)))
+    level.stop_music()
+    level = Level(level_path, ASSETS["background"], ASSETS_CACHE, WIDTH, HEIGHT)
+    level.reset()
+    level.respawn_invincibility = REPLAY.start_invincibility
+    print(f"▶ Replay {replay_path} ({REPLAY.ticks} ticks, {REPLAY.outcome})")
+    GAME_STATE.change("GAME")
+
+def end_replay(outcome):
+    """Fin du replay : compare à l'enregistrement et revient au menu"""
+    global REPLAY, REPLAY_INPUT
+    identical = (outcome == REPLAY.outcome and GAME_STATE.tick == REPLAY.ticks
+                 and final_state(level) == REPLAY.final_state)
+    if identical:
+        print(f"✅ Replay identique ({outcome} au tick {GAME_STATE.tick})")
+    else:
+        print(f"❌ Replay divergent : {outcome} au tick {GAME_STATE.tick}, "
+              f"{REPLAY.outcome} au tick {REPLAY.ticks} enregistré")
+    REPLAY = REPLAY_INPUT = None
+    level.stop_music()
+    level.reset()
+    GAME_STATE.change("MENU")
+
+def start_attempt():
+    """Début d'une tentative : compteur de pas et enregistrement (hors replay)"""
+    GAME_STATE.tick = 0
+    if REPLAY is None:
+        RECORDER.start(level)
+
+def prefetch_level(lvl):
+    """Précharge le thème et la musique d'un niveau (une seule fois)"""
+    LOADER.prefetch(lvl, level_assets(os.path.join(SCRIPT_DIR, "levels", lvl)))
+
+def prefetch_neighbours():
+    """Précharge les niveaux voisins du dernier niveau choisi (ou des premiers)"""
+    if GAME_STATE.selected_level in AVAILABLE_LEVELS:
+        index = AVAILABLE_LEVELS.index(GAME_STATE.selected_level)
+    else:
+        index = 0
+    for i in range(index - PREFETCH_NEIGHBOURS, index + PREFETCH_NEIGHBOURS + 1):
+        if 0 <= i < len(AVAILABLE_LEVELS):
+            prefetch_level(AVAILABLE_LEVELS[i])
+
+# Niveau en cours de chargement (état LOADING) : (chemin, lot d'assets)
+loading = None
+
 # ============================================
 # BOUCLE PRINCIPALE
 # ============================================
 
+accumulator = 0.0
+
+def toggle_trace():
+    """Démarre ou arrête l'enregistrement de la trace de frames"""
+    if not PROFILER.recording:
+        PROFILER.start_recording()
+        print("⏺ Enregistrement de la trace de frames")
+        return
+    name = time.strftime("frame_trace_%Y%m%d_%H%M%S") + TRACE_EXTENSION
+    path = PROFILER.stop_recording(os.path.join(SCRIPT_DIR, "traces", name))
+    if path:
+        print(f"💾 Trace écrite : {path}")
+
 while GAME_STATE.running:
-    dt = clock.tick(60) / 1000.0
-    dt = min(dt, 0.016)  # Clamp delta time
+    frame_time = min(clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)
+    
+    profiling = PROFILER.enabled
+    if profiling:
+        PROFILER.begin_frame()
     
     mouse_pos = pygame.mouse.get_pos()
     events = pygame.event.get()
@@ -203,6 +383,15 @@ while GAME_STATE.running:
         if event.type == pygame.QUIT:
             GAME_STATE.running = False
 
+        if event.type == pygame.KEYDOWN and event.key == PROFILER_KEY:
+            PROFILER.enabled = not PROFILER.enabled
+            Level.profiler = PROFILER if PROFILER.enabled else None
+            if not PROFILER.enabled and PROFILER.recording:
+                toggle_trace()
+
+        if event.type == pygame.KEYDOWN and event.key == TRACE_KEY and PROFILER.enabled:
+            toggle_trace()
+
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             if GAME_STATE.state == "GAME":
                 GAME_STATE.change("PAUSE")
@@ -211,6 +400,11 @@ while GAME_STATE.running:
                 GAME_STATE.change("GAME")
                 level.camera.is_paused = False
 
+    # Chargement en arrière-plan : conversions par petites tranches hors jeu
+    if GAME_STATE.state in ("MENU", "LEVEL_SELECT", "VICTORY"):
+        prefetch_neighbours()
+        LOADER.pump()
+
     # --------------------- MENU PRINCIPAL
     if GAME_STATE.state == "MENU":
         btns = draw_menu(screen, mouse_pos, GAME_STATE.state)
@@ -226,19 +420,49 @@ while GAME_STATE.running:
     elif GAME_STATE.state == "LEVEL_SELECT":
         data = draw_level_select(screen, mouse_pos, AVAILABLE_LEVELS, GAME_STATE.state)
 
+        # Niveau survolé : préchargé avant même le clic
+        for rect, lvl in data["levels"]:
+            if rect.collidepoint(mouse_pos):
+                prefetch_level(lvl)
+
         for e in events:
-            if e.type == pygame.MOUSEBUTTONDOWN:
+            if e.type == pygame.MOUSEWHEEL:
+                change_level_page(screen, -e.y)
+            if e.type == pygame.KEYDOWN and e.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                change_level_page(screen, 1 if e.key == pygame.K_RIGHT else -1)
+            
+            if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
                 if data["back"].collidepoint(mouse_pos):
                     GAME_STATE.change("MENU")
+                if data["prev"].collidepoint(mouse_pos):
+                    change_level_page(screen, -1)
+                if data["next"].collidepoint(mouse_pos):
+                    change_level_page(screen, 1)
 
                 for rect, lvl in data["levels"]:
                     if rect.collidepoint(mouse_pos):
                         GAME_STATE.selected_level = lvl
-                        level.stop_music()
                         lvl_path = os.path.join(SCRIPT_DIR, "levels", lvl)
-                        level = Level(lvl_path, ASSETS["background"], ASSETS_CACHE, WIDTH, HEIGHT)
-                        GAME_STATE.attempts = 0
-                        GAME_STATE.change("GAME")
+                        loading = (lvl_path, LOADER.load(lvl, level_assets(lvl_path)))
+                        GAME_STATE.change("LOADING")
+
+    # --------------------- CHARGEMENT NIVEAU
+    elif GAME_STATE.state == "LOADING":
+        lvl_path, job = loading
+        LOADER.pump(LOADING_CONVERT_BUDGET)
+        draw_loading_screen(screen, mouse_pos, job.progress, job.name)
+
+        # Assets prêts : la construction du Level n'a plus rien à décoder
+        if job.done:
+            level.stop_music()
+            level = Level(lvl_path, ASSETS["background"], ASSETS_CACHE, WIDTH, HEIGHT)
+            loading = None
+            start_attempt()
+            GAME_STATE.attempts = 0
+            accumulator = 0.0
+            GAME_STATE.change("GAME")
+            # Le temps de construction ne compte pas comme temps de jeu
+            clock.tick()
 
     # --------------------- PAUSE
     elif GAME_STATE.state == "PAUSE":
@@ -250,6 +474,9 @@ while GAME_STATE.running:
                     GAME_STATE.change("GAME")
                     level.camera.is_paused = False
                 if btns["menu"].collidepoint(mouse_pos):
+                    if REPLAY is not None:
+                        end_replay("interrupted")
+                    RECORDER.finish("interrupted")
                     level.stop_music()
                     level.reset()
                     GAME_STATE.change("MENU")
@@ -257,22 +484,48 @@ while GAME_STATE.running:
     # --------------------- JEU
     elif GAME_STATE.state == "GAME":
         keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE]:
-            level.player.jump()
+        if profiling:
+            PROFILER.lap("input")
 
-        # Update
-        is_dead, is_completed = level.update(dt)
-        
-        if is_dead:
-            GAME_STATE.attempts += 1
-            level.reset()
-        elif is_completed:
-            print(f"✅ Niveau complété en {GAME_STATE.attempts + 1} tentatives!")
-            GAME_STATE.change("VICTORY")
-
-        # Render
+        # Update : autant de pas fixes que le temps écoulé en contient
+        accumulator += frame_time
+        while accumulator >= Level.SIM_DT:
+            accumulator -= Level.SIM_DT
+            
+            if REPLAY_INPUT is not None:
+                pressed = REPLAY_INPUT(GAME_STATE.tick)
+            else:
+                pressed = keys[pygame.K_SPACE]
+                RECORDER.record(pressed)
+            if pressed:
+                level.player.jump()
+            
+            is_dead, is_completed = level.update(Level.SIM_DT)
+            GAME_STATE.tick += 1
+            
+            if REPLAY is not None and (is_dead or is_completed or GAME_STATE.tick >= REPLAY.ticks):
+                end_replay("completed" if is_completed else "died" if is_dead else "interrupted")
+                accumulator = 0.0
+                break
+            
+            if is_dead:
+                RECORDER.finish("died")
+                GAME_STATE.attempts += 1
+                level.reset()
+                start_attempt()
+            elif is_completed:
+                replay_path = RECORDER.finish("completed")
+                print(f"✅ Niveau complété en {GAME_STATE.attempts + 1} tentatives!")
+                if replay_path:
+                    print(f"💾 Replay : {replay_path}")
+                GAME_STATE.confetti = new_victory_confetti()
+                GAME_STATE.change("VICTORY")
+                accumulator = 0.0
+                break
+
+        # Render (interpolé entre les deux derniers pas)
         screen.fill((30,30,30))
-        level.draw(screen, WIDTH)
+        level.draw(screen, WIDTH, accumulator / Level.SIM_DT)
 
     # --------------------- VICTOIRE
     elif GAME_STATE.state == "VICTORY":
@@ -284,10 +537,30 @@ while GAME_STATE.running:
                     GAME_STATE.change("LEVEL_SELECT")
                 if btns["retry"].collidepoint(mouse_pos):
                     level.reset()
+                    start_attempt()
                     GAME_STATE.attempts = 0
                     GAME_STATE.change("GAME")
 
-    pygame.display.flip()
+    if profiling and PROFILER.enabled:
+        PROFILER.mark()
+        PROFILER.draw(screen)
+        PROFILER.lap("overlay")
+        # L'overlay recouvre la composition en cache des menus
+        invalidate_screen(screen)
+
+    # Menus, pause et victoire : seules les zones modifiées ; sinon tout l'écran
+    dirty = take_dirty_rects(screen)
+    if dirty is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(dirty)
+    
+    if profiling and PROFILER.enabled:
+        PROFILER.end_frame()
+
+# Tentative en cours à la fermeture
+RECORDER.finish("interrupted")
+print(f"📦 {ASSETS_CACHE!r}")
 
 pygame.quit()
 sys.exit()
\ No newline at end of file
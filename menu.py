@@ -1,7 +1,10 @@
 import pygame
 import random
 import math
+from array import array
 from config import WIDTH, HEIGHT
+from text_cache import render
+from dirty_renderer import DirtyRenderer
 
 # Couleurs modernes
 COLORS = {
@@ -19,49 +22,108 @@ COLORS = {
 GRADIENT_CACHE = {}
 PARTICLE_SYSTEM = None
 
-class Particle:
-    """Particule pour l'effet de fond animé"""
-    def __init__(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(0, HEIGHT)
-        self.vx = random.uniform(-20, 20)
-        self.vy = random.uniform(-20, 20)
-        self.size = random.randint(2, 6)
-        self.life = 1.0
-        self.max_life = random.uniform(1.5, 3.0)
-        self.color = random.choice([COLORS["primary"], COLORS["secondary"], COLORS["accent"]])
-    
-    def update(self, dt):
-        self.x += self.vx * dt * 30
-        self.y += self.vy * dt * 30
-        self.life -= dt
-        
-        # Wrap screen
-        if self.x < 0: self.x = WIDTH
-        if self.x > WIDTH: self.x = 0
-        if self.y < 0: self.y = HEIGHT
-        if self.y > HEIGHT: self.y = 0
-    
-    def draw(self, screen):
-        alpha = int(255 * (self.life / self.max_life))
-        surf = pygame.Surface((self.size*2, self.size*2), pygame.SRCALPHA)
-        pygame.draw.circle(surf, (*self.color, alpha), (self.size, self.size), self.size)
-        screen.blit(surf, (self.x - self.size, self.y - self.size))
+# Ombres, glows et icônes des boutons pré-rendus, par taille
+SHADOW_CACHE = {}
+BUTTON_GLOW_CACHE = {}
+ICON_CACHE = {}
+
+# Overlays unis (fade, assombrissement) : (taille, couleur) -> surface,
+# alpha réglé par set_alpha à chaque utilisation
+OVERLAY_CACHE = {}
+
+def get_overlay(size, color, alpha):
+    """Surface unie de taille size, réutilisée, avec l'alpha demandé"""
+    key = (size, color)
+    overlay = OVERLAY_CACHE.get(key)
+    if overlay is None:
+        overlay = pygame.Surface(size)
+        overlay.fill(color)
+        OVERLAY_CACHE[key] = overlay
+    overlay.set_alpha(alpha)
+    return overlay
+
+# Surface.fblits (pygame-ce seulement) : blits sans liste de rects en retour.
+# Absent de pygame 2.6 : on y dessine avec blits(doreturn=False)
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")
 
 class ParticleSystem:
-    """Système de particules de fond"""
+    """
+    Particules de fond : tableaux parallèles préalloués, mis à jour sur
+    place en une boucle, sprites pré-rendus par (taille, couleur, niveau
+    d'alpha) et dessin groupé (blits, ou fblits s'il existe).
+    """
+    
+    SIZES = (2, 3, 4, 5, 6)
+    PALETTE = ("primary", "secondary", "accent")
+    ALPHA_LEVELS = 16
+    
     def __init__(self, count=30):
-        self.particles = [Particle() for _ in range(count)]
+        self.count = count
+        self.x = array("d", bytes(8 * count))
+        self.y = array("d", bytes(8 * count))
+        self.vx = array("d", bytes(8 * count))
+        self.vy = array("d", bytes(8 * count))
+        self.life = array("d", bytes(8 * count))
+        self.max_life = array("d", bytes(8 * count))
+        # Sprite de chaque particule : premier index de sa série de niveaux d'alpha
+        self.sprite_base = array("i", bytes(4 * count))
+        self.offset = array("i", bytes(4 * count))
+        
+        self.sprites = self._build_sprites()
+        for i in range(count):
+            self._spawn(i)
+    
+    def _build_sprites(self):
+        """Un cercle par (taille, couleur, niveau d'alpha), rangés dans cet ordre"""
+        sprites = []
+        for size in self.SIZES:
+            for name in self.PALETTE:
+                for level in range(self.ALPHA_LEVELS):
+                    alpha = int(255 * (level + 1) / self.ALPHA_LEVELS)
+                    sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(sprite, (*COLORS[name], alpha), (size, size), size)
+                    sprites.append(sprite.convert_alpha())
+        return sprites
+    
+    def _spawn(self, i):
+        self.x[i] = random.randint(0, WIDTH)
+        self.y[i] = random.randint(0, HEIGHT)
+        self.vx[i] = random.uniform(-20, 20)
+        self.vy[i] = random.uniform(-20, 20)
+        size_index = random.randrange(len(self.SIZES))
+        color_index = random.randrange(len(self.PALETTE))
+        self.life[i] = 1.0
+        self.max_life[i] = random.uniform(1.5, 3.0)
+        self.sprite_base[i] = (size_index * len(self.PALETTE) + color_index) * self.ALPHA_LEVELS
+        self.offset[i] = self.SIZES[size_index]
     
     def update(self, dt):
-        for p in self.particles:
-            p.update(dt)
-            if p.life <= 0:
-                p.__init__()
+        step = dt * 30
+        xs, ys, vxs, vys, lives = self.x, self.y, self.vx, self.vy, self.life
+        # Déplacement, wrap de l'écran et vieillissement dans les tableaux existants
+        for i in range(self.count):
+            xs[i] = (xs[i] + vxs[i] * step) % WIDTH
+            ys[i] = (ys[i] + vys[i] * step) % HEIGHT
+            lives[i] -= dt
+            if lives[i] <= 0:
+                self._spawn(i)
+    
+    def rects(self):
+        """Zone de chaque particule (rendu par zones)"""
+        return [pygame.Rect(int(x) - offset, int(y) - offset, 2 * offset, 2 * offset)
+                for x, y, offset in zip(self.x, self.y, self.offset)]
     
     def draw(self, screen):
-        for p in self.particles:
-            p.draw(screen)
+        sprites = self.sprites
+        levels = self.ALPHA_LEVELS
+        top = levels - 1
+        batch = [(sprites[base + min(top, int(life / max_life * levels))], (int(x) - offset, int(y) - offset))
+                 for x, y, life, max_life, base, offset
+                 in zip(self.x, self.y, self.life, self.max_life, self.sprite_base, self.offset)]
+        if HAS_FBLITS:
+            screen.fblits(batch)
+        else:
+            screen.blits(batch, doreturn=False)
 
 class Button:
     """Bouton avec animations premium"""
@@ -72,9 +134,11 @@ class Button:
         self.is_hovered = False
         self.hover_progress = 0.0
         self.primary = primary
-        self.font = pygame.font.SysFont("Arial", 28, bold=True)
         
         self.gradient = self._create_gradient(w, h, primary)
+        self.shadow = self._create_shadow(w, h)
+        self.glow = self._create_glow(w + 10, h + 10)
+        self.icon_surf = self._create_icon(icon) if icon else None
     
     def _create_gradient(self, w, h, primary):
         """Crée un gradient dynamique"""
@@ -100,6 +164,35 @@ class Button:
         GRADIENT_CACHE[key] = surf
         return surf
     
+    def _create_shadow(self, w, h):
+        """Ombre portée (partagée par les boutons de même taille)"""
+        shadow = SHADOW_CACHE.get((w, h))
+        if shadow is None:
+            shadow = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(shadow, (0, 0, 0, 100), shadow.get_rect(), border_radius=15)
+            SHADOW_CACHE[(w, h)] = shadow
+        return shadow
+    
+    def _create_glow(self, w, h):
+        """Glow de survol opaque, atténué à l'affichage par set_alpha"""
+        glow = BUTTON_GLOW_CACHE.get((w, h))
+        if glow is None:
+            glow = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(glow, COLORS["glow"], glow.get_rect(), border_radius=18)
+            BUTTON_GLOW_CACHE[(w, h)] = glow
+        return glow
+    
+    def _create_icon(self, icon):
+        icon_surf = ICON_CACHE.get(icon)
+        if icon_surf is None:
+            icon_surf = pygame.Surface((30, 30), pygame.SRCALPHA)
+            if icon == "play":
+                pygame.draw.polygon(icon_surf, COLORS["white"], [(5, 5), (5, 25), (25, 15)])
+            elif icon == "back":
+                pygame.draw.polygon(icon_surf, COLORS["white"], [(25, 5), (5, 15), (25, 25)])
+            ICON_CACHE[icon] = icon_surf
+        return icon_surf
+    
     def update(self, mouse_pos):
         was_hovered = self.is_hovered
         self.is_hovered = self.rect.collidepoint(mouse_pos)
@@ -110,6 +203,15 @@ class Button:
         
         return self.is_hovered and not was_hovered
     
+    def area(self):
+        """Zone couverte par le dessin (décalage de survol, ombre et glow compris)"""
+        return self.rect.inflate(10, 20)
+    
+    def visual_state(self):
+        """Change quand l'apparence du bouton change (rendu par zones)"""
+        glow_alpha = int(50 * self.hover_progress) if self.hover_progress > 0.1 else 0
+        return (int(-5 * self.hover_progress), glow_alpha)
+    
     def draw(self, screen):
         # Position avec hover offset
         offset_y = -5 * self.hover_progress
@@ -117,42 +219,42 @@ class Button:
         draw_rect.y += int(offset_y)
         
         # Ombre
-        shadow = pygame.Surface((self.rect.w, self.rect.h), pygame.SRCALPHA)
-        pygame.draw.rect(shadow, (0, 0, 0, 100), shadow.get_rect(), border_radius=15)
-        screen.blit(shadow, draw_rect.move(0, 5))
+        screen.blit(self.shadow, draw_rect.move(0, 5))
         
         # Bouton gradient
         screen.blit(self.gradient, draw_rect)
         
         # Glow effect
         if self.hover_progress > 0.1:
-            glow = pygame.Surface((draw_rect.w + 10, draw_rect.h + 10), pygame.SRCALPHA)
-            pygame.draw.rect(glow, (*COLORS["glow"], int(50 * self.hover_progress)), 
-                           glow.get_rect(), border_radius=18)
-            screen.blit(glow, glow.get_rect(center=draw_rect.center))
+            self.glow.set_alpha(int(50 * self.hover_progress))
+            screen.blit(self.glow, self.glow.get_rect(center=draw_rect.center))
         
         # Texte
-        text_surf = self.font.render(self.text, True, COLORS["white"])
+        text_surf = render(self.text, 28, COLORS["white"], bold=True)
         text_rect = text_surf.get_rect(center=draw_rect.center)
         screen.blit(text_surf, text_rect)
         
         # Icône
-        if self.icon:
-            icon_surf = pygame.Surface((30, 30), pygame.SRCALPHA)
-            if self.icon == "play":
-                pygame.draw.polygon(icon_surf, COLORS["white"], [(5, 5), (5, 25), (25, 15)])
-            elif self.icon == "back":
-                pygame.draw.polygon(icon_surf, COLORS["white"], [(25, 5), (5, 15), (25, 25)])
-            screen.blit(icon_surf, icon_surf.get_rect(center=(draw_rect.left + 40, draw_rect.centery)))
+        if self.icon_surf:
+            screen.blit(self.icon_surf, self.icon_surf.get_rect(center=(draw_rect.left + 40, draw_rect.centery)))
 
 class MenuManager:
     """Gère tous les menus avec transitions"""
+    
+    # Grille de sélection de niveau, par page (coût par frame constant
+    # quel que soit le nombre de niveaux)
+    LEVEL_COLUMNS = 3
+    LEVEL_ROWS = 3
+    
     def __init__(self, screen):
         self.screen = screen
         self.particle_system = ParticleSystem()
         self.fade_alpha = 0
         self.fade_target = 0
         
+        # Écrans presque statiques : composition en cache, zones modifiées seulement
+        self.renderer = DirtyRenderer()
+        
         # Boutons du menu principal
         self.main_buttons = {
             "play": Button(WIDTH//2 - 125, 250, 250, 60, "PLAY", "play"),
@@ -164,6 +266,16 @@ class MenuManager:
             "resume": Button(WIDTH//2 - 100, HEIGHT//2 - 50, 200, 50, "RESUME", "play"),
             "menu": Button(WIDTH//2 - 100, HEIGHT//2 + 20, 200, 50, "MAIN MENU", "back", primary=False)
         }
+        
+        # Sélection de niveau : boutons conservés d'une frame à l'autre,
+        # ceux de la grille reconstruits seulement quand la page change
+        self.back_button = Button(20, 20, 120, 40, "← BACK", "back", primary=False)
+        self.prev_button = Button(WIDTH//2 - 190, HEIGHT - 110, 120, 44, "< PREV", primary=False)
+        self.next_button = Button(WIDTH//2 + 70, HEIGHT - 110, 120, 44, "NEXT >", primary=False)
+        self.level_list = None
+        self.level_count = 0
+        self.level_page = 0
+        self.level_buttons = []
     
     def update(self, mouse_pos, dt, game_state):
         """Met à jour tous les éléments du menu"""
@@ -189,132 +301,191 @@ class MenuManager:
         if game_state != "MENU":
             return {}
         
-        # Fond animé
-        screen.fill(COLORS["bg"])
-        self.particle_system.draw(screen)
+        # Fond animé : seules les zones des particules et des boutons qui changent sont redessinées
+        self.renderer.render(screen, "MENU", self._compose_main, self.particle_system.rects(),
+                             self.particle_system.draw, self.main_buttons.values())
+        self._draw_fade(screen)
+        
+        return {key: btn.rect for key, btn in self.main_buttons.items()}
+    
+    def _compose_main(self, screen):
+        """Fond uni ; titre avec glow, ligne décorative et footer au-dessus des particules"""
+        background = pygame.Surface((WIDTH, HEIGHT))
+        background.fill(COLORS["bg"])
         
         # Titre avec glow
-        title_font = pygame.font.SysFont("Arial", 72, bold=True)
-        title_surf = title_font.render("GEOMETRY DASH", True, COLORS["primary"])
+        title_surf = render("GEOMETRY DASH", 72, COLORS["primary"], bold=True)
         title_rect = title_surf.get_rect(center=(WIDTH//2, 120))
         
         glow = pygame.Surface((title_rect.w + 20, title_rect.h + 20), pygame.SRCALPHA)
         pygame.draw.rect(glow, (*COLORS["glow"], 30), glow.get_rect(), border_radius=10)
-        screen.blit(glow, glow.get_rect(center=title_rect.center))
-        
-        screen.blit(title_surf, title_rect)
         
         # Ligne décorative
-        line_y = 180
+        line = pygame.Surface((WIDTH, 3), pygame.SRCALPHA)
         for x in range(0, WIDTH, 40):
-            pygame.draw.rect(screen, COLORS["primary"], (x, line_y, 20, 3))
-            pygame.draw.rect(screen, COLORS["secondary"], (x + 20, line_y, 20, 3))
-        
-        # Boutons
-        for btn in self.main_buttons.values():
-            btn.draw(screen)
+            pygame.draw.rect(line, COLORS["primary"], (x, 0, 20, 3))
+            pygame.draw.rect(line, COLORS["secondary"], (x + 20, 0, 20, 3))
         
         # Footer
-        footer_font = pygame.font.SysFont("Arial", 16)
-        footer = footer_font.render("PREMIUM EDITION - Version 1.0", True, COLORS["gray"])
-        screen.blit(footer, footer.get_rect(center=(WIDTH//2, HEIGHT - 30)))
-        
-        # Fade overlay
-        if self.fade_alpha > 0:
-            fade = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            fade.fill((0, 0, 0, int(self.fade_alpha)))
-            screen.blit(fade, (0, 0))
-        
-        return {key: btn.rect for key, btn in self.main_buttons.items()}
+        footer = render("PREMIUM EDITION - Version 1.0", 16, COLORS["gray"])
+        
+        overlays = [
+            (glow, glow.get_rect(center=title_rect.center).topleft),
+            (title_surf, title_rect.topleft),
+            (line, (0, 180)),
+            (footer, footer.get_rect(center=(WIDTH//2, HEIGHT - 30)).topleft),
+        ]
+        return background, overlays
     
     def draw_pause(self, screen, game_state):
         """Dessine le menu pause premium"""
         if game_state != "PAUSE":
             return {}
         
-        # Overlay semi-transparent
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((*COLORS["bg"], 200))
-        screen.blit(overlay, (0, 0))
+        # Écran figé : seuls les boutons survolés sont redessinés
+        self.renderer.render(screen, "PAUSE", self._compose_pause, [], lambda screen: None,
+                             self.pause_buttons.values())
+        self._draw_fade(screen)
+        
+        return {key: btn.rect for key, btn in self.pause_buttons.items()}
+    
+    def _compose_pause(self, screen):
+        """Fond assombri (au niveau final), panneau et titre"""
+        # L'overlay à 200 d'alpha, reblitté à chaque frame sur l'image figée,
+        # finissait par la recouvrir entièrement : on part directement de sa couleur
+        background = pygame.Surface((WIDTH, HEIGHT))
+        background.fill(COLORS["bg"])
         
         # Panneau central
         panel = pygame.Rect(WIDTH//2 - 150, HEIGHT//2 - 120, 300, 240)
-        pygame.draw.rect(screen, COLORS["dark"], panel, border_radius=20)
+        pygame.draw.rect(background, COLORS["dark"], panel, border_radius=20)
         
         # Bordure glow
         border = pygame.Surface((panel.w + 6, panel.h + 6), pygame.SRCALPHA)
         pygame.draw.rect(border, (*COLORS["primary"], 100), border.get_rect(), border_radius=23)
-        screen.blit(border, border.get_rect(center=panel.center).move(-3, -3))
+        background.blit(border, border.get_rect(center=panel.center).move(-3, -3))
         
         # Titre
-        title_font = pygame.font.SysFont("Arial", 48, bold=True)
-        title = title_font.render("PAUSED", True, COLORS["primary"])
-        screen.blit(title, title.get_rect(center=(WIDTH//2, panel.top + 40)))
-        
-        # Boutons
-        for btn in self.pause_buttons.values():
-            btn.draw(screen)
-        
-        # Fade
-        if self.fade_alpha > 0:
-            fade = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            fade.fill((0, 0, 0, int(self.fade_alpha)))
-            screen.blit(fade, (0, 0))
-        
-        return {key: btn.rect for key, btn in self.pause_buttons.items()}
+        title = render("PAUSED", 48, COLORS["primary"], bold=True)
+        background.blit(title, title.get_rect(center=(WIDTH//2, panel.top + 40)))
+        return background, []
     
     def draw_level_select(self, screen, mouse_pos, available_levels, game_state):
         """Dessine la sélection de niveau premium"""
         if game_state != "LEVEL_SELECT":
             return {"back": pygame.Rect(0,0,0,0), "levels": []}
         
-        screen.fill(COLORS["bg"])
-        self.particle_system.draw(screen)
+        # Liste de niveaux changée : retour à la première page
+        if available_levels is not self.level_list or len(available_levels) != self.level_count:
+            self.level_list = available_levels
+            self.level_count = len(available_levels)
+            self.level_page = 0
+            self._build_level_page()
+        
+        # Boutons : retour, grille des niveaux (page courante), pagination
+        widgets = [self.back_button] + self.level_buttons
+        prev_rect = next_rect = pygame.Rect(0, 0, 0, 0)
+        pages = self.level_page_count()
+        if pages > 1:
+            if self.level_page > 0:
+                widgets.append(self.prev_button)
+                prev_rect = self.prev_button.rect
+            if self.level_page < pages - 1:
+                widgets.append(self.next_button)
+                next_rect = self.next_button.rect
+        for btn in widgets:
+            btn.update(mouse_pos)
+        
+        self.renderer.render(screen, ("LEVEL_SELECT", self.level_page, self.level_count),
+                             self._compose_level_select, self.particle_system.rects(),
+                             self.particle_system.draw, widgets)
+        self._draw_fade(screen)
+        
+        level_buttons = [(btn.rect, btn.level_name) for btn in self.level_buttons]
+        return {"back": self.back_button.rect, "levels": level_buttons,
+                "prev": prev_rect, "next": next_rect}
+    
+    def _compose_level_select(self, screen):
+        """Fond uni ; titre, numéro de page et message au-dessus des particules"""
+        background = pygame.Surface((WIDTH, HEIGHT))
+        background.fill(COLORS["bg"])
         
         # Titre
-        title_font = pygame.font.SysFont("Arial", 48, bold=True)
-        title = title_font.render("SELECT LEVEL", True, COLORS["primary"])
-        screen.blit(title, title.get_rect(center=(WIDTH//2, 60)))
+        title = render("SELECT LEVEL", 48, COLORS["primary"], bold=True)
+        overlays = [(title, title.get_rect(center=(WIDTH//2, 60)).topleft)]
         
-        # Bouton retour
-        back_btn = Button(20, 20, 120, 40, "← BACK", "back", primary=False)
-        back_btn.update(mouse_pos)
-        back_btn.draw(screen)
+        # Pagination
+        pages = self.level_page_count()
+        if pages > 1:
+            page_text = render(f"{self.level_page + 1} / {pages}", 20, COLORS["gray"])
+            overlays.append((page_text, page_text.get_rect(center=(WIDTH//2, self.prev_button.rect.centery)).topleft))
+        
+        # Message si pas de niveaux
+        if not self.level_count:
+            msg1 = render("No levels available", 24, COLORS["gray"])
+            msg2 = render("Create levels in the 'levels' folder", 24, COLORS["gray"])
+            overlays.append((msg1, msg1.get_rect(center=(WIDTH//2, HEIGHT//2)).topleft))
+            overlays.append((msg2, msg2.get_rect(center=(WIDTH//2, HEIGHT//2 + 40)).topleft))
+        return background, overlays
+    
+    def _draw_fade(self, screen):
+        """Fade plein écran par-dessus la composition (l'écran entier est alors présenté)"""
+        if self.fade_alpha > 0:
+            screen.blit(get_overlay((WIDTH, HEIGHT), (0, 0, 0), int(self.fade_alpha)), (0, 0))
+            self.renderer.invalidate()
+    
+    def level_page_count(self):
+        per_page = self.LEVEL_COLUMNS * self.LEVEL_ROWS
+        return max(1, (self.level_count + per_page - 1) // per_page)
+    
+    def change_level_page(self, delta):
+        """Page suivante (delta > 0) ou précédente de la grille de niveaux"""
+        page = max(0, min(self.level_page + delta, self.level_page_count() - 1))
+        if page != self.level_page:
+            self.level_page = page
+            self._build_level_page()
+    
+    def _build_level_page(self):
+        """Boutons des niveaux de la page courante"""
+        per_page = self.LEVEL_COLUMNS * self.LEVEL_ROWS
+        first = self.level_page * per_page
         
-        # Grille des niveaux
-        level_buttons = []
         level_width, level_height = 180, 60
         start_x = WIDTH//2 - (level_width * 2 + 40) // 2
         start_y = 150
         
-        for i, level_name in enumerate(available_levels):
-            row = i // 3
-            col = i % 3
+        self.level_buttons = []
+        for i, level_name in enumerate(self.level_list[first:first + per_page]):
+            row = i // self.LEVEL_COLUMNS
+            col = i % self.LEVEL_COLUMNS
             x = start_x + col * (level_width + 20)
             y = start_y + row * (level_height + 20)
             
-            btn = Button(x, y, level_width, level_height, 
-                        f"Level {i+1}", primary=(i % 2 == 0))
+            index = first + i
+            btn = Button(x, y, level_width, level_height,
+                         f"Level {index + 1}", primary=(index % 2 == 0))
             btn.level_name = level_name
-            hovered = btn.update(mouse_pos)
-            btn.draw(screen)
-            level_buttons.append((btn.rect, level_name))
+            self.level_buttons.append(btn)
+
+    def draw_loading(self, screen, progress, label):
+        """Écran de chargement : barre de progression (assets préparés en arrière-plan)"""
+        screen.fill(COLORS["bg"])
+        self.particle_system.draw(screen)
         
-        # Message si pas de niveaux
-        if not available_levels:
-            msg_font = pygame.font.SysFont("Arial", 24)
-            msg1 = msg_font.render("No levels available", True, COLORS["gray"])
-            msg2 = msg_font.render("Create levels in the 'levels' folder", True, COLORS["gray"])
-            screen.blit(msg1, msg1.get_rect(center=(WIDTH//2, HEIGHT//2)))
-            screen.blit(msg2, msg2.get_rect(center=(WIDTH//2, HEIGHT//2 + 40)))
-        
-        # Fade
-        if self.fade_alpha > 0:
-            fade = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            fade.fill((0, 0, 0, int(self.fade_alpha)))
-            screen.blit(fade, (0, 0))
+        title = render("LOADING", 48, COLORS["primary"], bold=True)
+        screen.blit(title, title.get_rect(center=(WIDTH//2, HEIGHT//2 - 80)))
         
-        return {"back": back_btn.rect, "levels": level_buttons}
+        # Barre de progression
+        bar = pygame.Rect(WIDTH//2 - 200, HEIGHT//2 - 12, 400, 24)
+        pygame.draw.rect(screen, COLORS["dark"], bar, border_radius=12)
+        filled = bar.copy()
+        filled.w = int(bar.w * progress)
+        if filled.w > 0:
+            pygame.draw.rect(screen, COLORS["primary"], filled, border_radius=12)
+        pygame.draw.rect(screen, COLORS["primary"], bar, 2, border_radius=12)
+        
+        text = render(f"{label} - {int(progress * 100)}%", 20, COLORS["gray"])
+        screen.blit(text, text.get_rect(center=(WIDTH//2, bar.bottom + 30)))
 
 # Global menu manager
 MENU_MANAGER = None
@@ -339,4 +510,20 @@ def draw_pause_menu(screen, mouse_pos, game_state):
 def draw_level_select(screen, mouse_pos, available_levels, game_state):
     manager = get_menu_manager(screen)
     manager.update(mouse_pos, 0.016, game_state)
-    return manager.draw_level_select(screen, mouse_pos, available_levels, game_state)
\ No newline at end of file
+    return manager.draw_level_select(screen, mouse_pos, available_levels, game_state)
+
+def change_level_page(screen, delta):
+    get_menu_manager(screen).change_level_page(delta)
+
+def take_dirty_rects(screen):
+    """Zones à présenter pour la frame (None : tout l'écran)"""
+    return get_menu_manager(screen).renderer.take()
+
+def invalidate_screen(screen):
+    """L'écran a été dessiné hors des menus : prochaine frame recomposée"""
+    get_menu_manager(screen).renderer.invalidate()
+
+def draw_loading_screen(screen, mouse_pos, progress, label):
+    manager = get_menu_manager(screen)
+    manager.update(mouse_pos, 0.016, "LOADING")
+    manager.draw_loading(screen, progress, label)
@@ -1,6 +1,36 @@
 import pygame
 import random
 import math
+from array import array
+
+# Mode flyweight : toutes les tuiles d'un même type partagent la surface
+# du thème (déjà convert_alpha) au lieu d'en garder une copie chacune.
+# Ces images partagées ne doivent donc jamais être modifiées.
+SHARED_TILE_IMAGES = True
+
+def _tile_image(image):
+    """Retourne l'image partagée du thème, ou une copie si le mode flyweight est coupé"""
+    return image if SHARED_TILE_IMAGES else image.copy()
+
+# Halos des orbs pré-rendus : (largeur, hauteur, additif) -> surface
+GLOW_CACHE = {}
+GLOW_COLOR = (255, 255, 100, 60)
+
+def get_glow(width, height, additive=False):
+    """Halo circulaire partagé par toutes les orbs de cette taille"""
+    key = (width, height, additive)
+    glow = GLOW_CACHE.get(key)
+    if glow is None:
+        glow = pygame.Surface((width, height), pygame.SRCALPHA)
+        r, g, b, a = GLOW_COLOR
+        if additive:
+            # Couleur prémultipliée : ajoutée telle quelle à l'écran
+            color = (r * a // 255, g * a // 255, b * a // 255, a)
+        else:
+            color = GLOW_COLOR
+        pygame.draw.circle(glow, color, (width // 2, height // 2), width // 2)
+        GLOW_CACHE[key] = glow
+    return glow
 
 class Platform(pygame.sprite.Sprite):
     """Plateforme avec texture de thème"""
@@ -10,8 +40,8 @@ class Platform(pygame.sprite.Sprite):
         
         self.world_x = world_x
         
-        # Copie de l'image pour éviter modifications
-        self.image = block_image.copy()
+        # Image partagée avec toutes les plateformes du thème
+        self.image = _tile_image(block_image)
         self.rect = self.image.get_rect(topleft=(world_x, y))
 
 class Spike(pygame.sprite.Sprite):
@@ -22,8 +52,8 @@ class Spike(pygame.sprite.Sprite):
         
         self.world_x = world_x
         
-        # Copie de l'image
-        self.image = spike_image.copy()
+        # Image partagée avec tous les pics du thème
+        self.image = _tile_image(spike_image)
         self.rect = self.image.get_rect()
         self.rect.centerx = world_x + tile_size // 2
         self.rect.bottom = ground_y
@@ -42,15 +72,21 @@ class Spike(pygame.sprite.Sprite):
 # NOUVEAU : Orb pour double saut
 class Orb(pygame.sprite.Sprite):
     """Orb qui permet un double saut"""
+    
+    # Halo en mélange additif (BLEND_RGBA_ADD) au lieu du mélange alpha
+    ADDITIVE_GLOW = False
+    
+    # Taille de l'image par rapport à la tuile (mise à l'échelle par Level)
+    SIZE_RATIO = 0.6
+    
     def __init__(self, world_x, y, tile_size, orb_image):
         super().__init__()
         
         self.world_x = world_x
         self.tile_size = tile_size
         
-        # Image redimensionnée
-        orb_size = int(tile_size * 0.6)
-        self.image = pygame.transform.scale(orb_image, (orb_size, orb_size))
+        # Image à la taille SIZE_RATIO (partagée avec toutes les orbs du thème)
+        self.image = orb_image
         
         # Position
         self.rect = self.image.get_rect()
@@ -78,19 +114,28 @@ class Orb(pygame.sprite.Sprite):
         if self.collected:
             return
         
-        # Glow effect
-        glow = pygame.Surface((self.rect.w + 20, self.rect.h + 20), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (255, 255, 100, 60), 
-                          (glow.get_width()//2, glow.get_height()//2), 
-                          glow.get_width()//2)
-        screen.blit(glow, camera.apply(glow.get_rect(center=self.rect.center)))
+        screen_rect = camera.apply(self.rect)
+        
+        # Glow effect (halo pré-rendu partagé)
+        glow = get_glow(self.rect.w + 20, self.rect.h + 20, self.ADDITIVE_GLOW)
+        glow_pos = glow.get_rect(center=screen_rect.center)
+        if self.ADDITIVE_GLOW:
+            screen.blit(glow, glow_pos, special_flags=pygame.BLEND_RGBA_ADD)
+        else:
+            screen.blit(glow, glow_pos)
         
         # Orb
-        screen.blit(self.image, camera.apply(self.rect))
+        screen.blit(self.image, screen_rect)
     
     def collect(self):
         """Marque comme collecté"""
         self.collected = True
+    
+    def reset(self):
+        """Remet l'orb dans son état de départ"""
+        self.collected = False
+        self.float_offset = 0
+        self.rect.y = self.base_y
 
 # ============================
 # NOUVEAU : Zone de fin
@@ -112,50 +157,104 @@ class FinishFlag(pygame.sprite.Sprite):
         pass
 
 # ============================
-# PARTICULES : Effet poussière
-class DustParticle(pygame.sprite.Sprite):
-    """Particule de poussière 16x16 pour éviter overflow"""
+# PARTICULES : Effet poussière (pool de taille fixe)
+class DustParticlePool:
+    """
+    Pool de particules de poussière : tableaux parallèles de taille fixe,
+    mis à jour sur place par une boucle sur les slots vivants (pas de
+    calcul vectorisé), slots recyclés et sprites de fondu pré-rendus.
+    """
     
-    def __init__(self, x, y):
-        super().__init__()
+    CAPACITY = 128
+    GRAVITY = 500.0
+    MAX_LIFE = 0.4
+    SIZE = 6.0
+    FADE_LEVELS = 12
+    
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.x = array("d", bytes(8 * capacity))
+        self.y = array("d", bytes(8 * capacity))
+        self.vx = array("d", bytes(8 * capacity))
+        self.vy = array("d", bytes(8 * capacity))
+        self.life = array("d", bytes(8 * capacity))
         
-        self.image = pygame.Surface((16, 16), pygame.SRCALPHA)
-        self.pos = pygame.Vector2(x, y)
-        self.rect = self.image.get_rect(center=self.pos)
-        
-        # Propriétés
-        self.base_color = (255, 255, 255)
-        self.vel = pygame.Vector2(
-            random.uniform(-100, 100),
-            random.uniform(-80, -30)
-        )
-        self.gravity = 500.0
-        self.life = 0.4
-        self.max_life = 0.4
-        self.size = 6.0
+        # Slots vivants (du plus ancien au plus récent) et slots libres
+        self.active = []
+        self.free = list(range(capacity - 1, -1, -1))
         
+        self.sprites = self._build_fade_sprites()
+    
+    def _build_fade_sprites(self):
+        """Une image 16x16 par niveau de fondu (taille et alpha décroissants)"""
+        sprites = []
+        for level in range(self.FADE_LEVELS):
+            progress = (level + 1) / self.FADE_LEVELS
+            sprite = pygame.Surface((16, 16), pygame.SRCALPHA)
+            current_size = int(self.SIZE * progress)
+            if current_size > 0:
+                alpha = int(255 * progress)
+                pygame.draw.circle(sprite, (255, 255, 255, alpha), (8, 8), current_size)
+            sprites.append(sprite)
+        return sprites
+    
+    def emit(self, x, y, count):
+        """Émet count particules en (x, y), en recyclant les plus anciennes si le pool est plein"""
+        for _ in range(count):
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = self.active.pop(0)
+            self.x[slot] = x
+            self.y[slot] = y
+            self.vx[slot] = random.uniform(-100, 100)
+            self.vy[slot] = random.uniform(-80, -30)
+            self.life[slot] = self.MAX_LIFE
+            self.active.append(slot)
+    
     def update(self, dt):
-        """Met à jour la particule"""
-        self.vel.y += self.gravity * dt
-        self.pos += self.vel * dt
-        self.rect.center = self.pos
-        
-        self.life -= dt
-        progress = max(0, self.life / self.max_life)
-        
-        # Recréation image
-        self.image.fill((0, 0, 0, 0))
-        
-        current_size = int(self.size * progress)
-        if current_size > 0:
-            alpha = int(255 * progress)
-            color = (*self.base_color, alpha)
-            pygame.draw.circle(self.image, color, (8, 8), current_size)
+        """Met à jour toutes les particules vivantes et libère les mortes"""
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        gravity_step = self.GRAVITY * dt
+        still_alive = []
+        for slot in self.active:
+            vy[slot] += gravity_step
+            x[slot] += vx[slot] * dt
+            y[slot] += vy[slot] * dt
+            life[slot] -= dt
+            if life[slot] > 0:
+                still_alive.append(slot)
+            else:
+                self.free.append(slot)
+        self.active = still_alive
     
-    def draw(self, screen, camera):
-        """Dessine particule avec offset caméra"""
-        screen.blit(self.image, camera.apply(self.rect))
+    def clear(self):
+        """Supprime toutes les particules"""
+        self.free.extend(self.active)
+        self.active = []
+    
+    def __len__(self):
+        return len(self.active)
+    
+    def draw(self, screen, camera, visible_left, visible_right):
+        """
+        Dessine les particules dont l'image (16x16) touche la fenêtre
+        [visible_left, visible_right] du monde, en un seul appel blits.
+        """
+        if not self.active:
+            return
         
-    def is_alive(self):
-        return self.life > 0
+        offset_x = int(-camera.render_offset_x) - 8
+        levels = self.FADE_LEVELS
+        sprites = self.sprites
+        x, y, life = self.x, self.y, self.life
+        # Centre de la particule : visible si son image déborde dans la fenêtre
+        min_x = visible_left - 8
+        max_x = visible_right + 8
+        batch = []
+        for slot in self.active:
+            if min_x < x[slot] < max_x:
+                level = min(levels - 1, int(life[slot] / self.MAX_LIFE * levels))
+                batch.append((sprites[level], (int(x[slot]) + offset_x, int(y[slot]) - 8)))
+        screen.blits(batch, doreturn=False)
 # ============================
\ No newline at end of file
@@ -1,5 +1,9 @@
 import pygame
 
+# Atlas de rotation partagés entre joueurs : image à l'échelle -> frames
+ROTATION_ATLAS_CACHE = {}
+ROTATION_ATLAS_CACHE_SIZE = 4
+
 class Player(pygame.sprite.Sprite):
     """Cube du joueur avec rotation GD-authentique et double saut."""
     
@@ -7,33 +11,59 @@ class Player(pygame.sprite.Sprite):
     JUMP_VELOCITY = -800.0
     ROTATION_SPEED_PER_SEC = 720.0
     
-    COYOTE_FRAMES = 5
-    JUMP_BUFFER_FRAMES = 5
+    # Fenêtres en secondes (5 frames à 60 fps), indépendantes du pas de simulation
+    COYOTE_TIME = 5 / 60
+    JUMP_BUFFER_TIME = 5 / 60
+    
+    # Taille de l'image de jeu par rapport à l'image du thème (appliquée par Level)
+    IMAGE_SCALE = 0.55
+    
+    # Atlas de rotation : une frame tous les 360 / ROTATION_STEPS degrés
+    ROTATION_STEPS = 180
+    
+    # Attributs qui forment l'état dynamique (snapshot/restauration)
+    STATE_FIELDS = (
+        "pos_x_float", "pos_y_float", "vel_y", "is_jumping", "s_was_on_ground",
+        "coyote_timer", "jump_buffered", "jump_buffer_timer",
+        "angle", "remaining_rotation",
+        "can_double_jump", "has_used_double_jump",
+    )
 
-    def __init__(self, world_x, y, image):
+    def __init__(self, world_x, y, image, headless=False):
         super().__init__()
 
-        # IMAGE & DIMENSIONS
-        scale = 0.55
-        w = int(image.get_width() * scale)
-        h = int(image.get_height() * scale)
+        # IMAGE & DIMENSIONS (image déjà à l'échelle IMAGE_SCALE, voir Level)
+        w, h = image.get_size()
         
-        self.image_originale = pygame.transform.scale(image, (w, h))
+        self.image_originale = image
         self.image = self.image_originale.copy()
+        
+        # RENDU PRÉ-CALCULÉ (aucune allocation par frame dans draw)
+        # En mode headless le joueur n'est jamais dessiné
+        self.rotation_atlas = None
+        self.aura_image = None
+        if not headless:
+            self.rotation_atlas = self._get_rotation_atlas(self.image_originale)
+            self.aura_image = pygame.Surface((w + 20, h + 20), pygame.SRCALPHA)
+            pygame.draw.ellipse(self.aura_image, (0, 200, 255, 100), self.aura_image.get_rect())
 
-        # PHYSIQUE & POSITION
+        # PHYSIQUE & POSITION (positions en flottants, la hitbox est entière)
+        self.pos_x_float = float(world_x)
         self.pos_y_float = float(y)
         self.hitbox = pygame.Rect(world_x, y, w, h)
         
+        # Position au pas de simulation précédent (rendu interpolé)
+        self.prev_center = self.hitbox.center
+        
         # ÉTAT
         self.vel_y = 0.0
         self.is_jumping = False
         self.s_was_on_ground = True
         
         # COYOTE & BUFFER
-        self.coyote_timer = 0
+        self.coyote_timer = 0.0
         self.jump_buffered = False
-        self.jump_buffer_timer = 0
+        self.jump_buffer_timer = 0.0
         
         # ROTATION
         self.angle = 0.0
@@ -43,13 +73,28 @@ class Player(pygame.sprite.Sprite):
         self.can_double_jump = False
         self.has_used_double_jump = False
 
+    @classmethod
+    def _get_rotation_atlas(cls, scaled):
+        """Frames pré-tournées de l'image (partagées entre joueurs du même thème)"""
+        key = scaled
+        atlas = ROTATION_ATLAS_CACHE.get(key)
+        if atlas is None:
+            step = 360.0 / cls.ROTATION_STEPS
+            atlas = [pygame.transform.rotate(scaled, i * step) for i in range(cls.ROTATION_STEPS)]
+            
+            # Cache borné : on oublie l'atlas le plus ancien
+            if len(ROTATION_ATLAS_CACHE) >= ROTATION_ATLAS_CACHE_SIZE:
+                del ROTATION_ATLAS_CACHE[next(iter(ROTATION_ATLAS_CACHE))]
+            ROTATION_ATLAS_CACHE[key] = atlas
+        return atlas
+
     def _trigger_jump(self):
         """Déclenche le saut et la rotation"""
         self.vel_y = self.JUMP_VELOCITY
         self.remaining_rotation = 180.0
-        self.coyote_timer = 0
+        self.coyote_timer = 0.0
         self.jump_buffered = False
-        self.jump_buffer_timer = 0
+        self.jump_buffer_timer = 0.0
 
     def jump(self):
         """Tente de sauter avec buffer et double saut"""
@@ -68,15 +113,18 @@ class Player(pygame.sprite.Sprite):
         # Buffer si on appuie trop tôt
         elif self.is_jumping and not self.s_was_on_ground:
             self.jump_buffered = True
-            self.jump_buffer_timer = self.JUMP_BUFFER_FRAMES
+            self.jump_buffer_timer = self.JUMP_BUFFER_TIME
         
         return False
 
-    def update(self, platforms, dt, camera):
-        """Mise à jour physique et rotation"""
+    def update(self, platform_index, dt, camera):
+        """Mise à jour physique et rotation (platform_index : ColumnIndex du niveau)"""
+        self.prev_center = self.hitbox.center
         
-        # Déplacement horizontal (suivi caméra)
-        self.hitbox.x += camera.scroll_speed * dt
+        # Déplacement horizontal (suivi caméra) : accumulé en flottant, sinon la
+        # fraction de pixel perdue à chaque pas dépend de SIM_HZ
+        self.pos_x_float += camera.scroll_speed * dt
+        self.hitbox.x = int(self.pos_x_float)
         
         # Gravité
         self.vel_y += self.GRAVITY_PER_SEC * dt
@@ -85,7 +133,7 @@ class Player(pygame.sprite.Sprite):
 
         # Coyote time
         if self.is_jumping:
-            self.coyote_timer = max(0, self.coyote_timer - 1)
+            self.coyote_timer = max(0.0, self.coyote_timer - dt)
 
         # ROTATION
         if self.remaining_rotation > 0:
@@ -102,7 +150,9 @@ class Player(pygame.sprite.Sprite):
         on_ground = False
         temp_y = self.hitbox.y
 
-        for platform in platforms:
+        # Broad-phase : seules les colonnes sous la hitbox sont testées
+        # (la hitbox ne bouge plus horizontalement pendant la boucle)
+        for platform in platform_index.query(self.hitbox):
             if self.hitbox.colliderect(platform.rect):
                 # Collision par le haut (atterrissage)
                 if self.vel_y > 0 and temp_y < platform.rect.top:
@@ -140,43 +190,67 @@ class Player(pygame.sprite.Sprite):
         # États jumping/coyote
         if on_ground:
             self.is_jumping = False
-            self.coyote_timer = 0
+            self.coyote_timer = 0.0
             self.has_used_double_jump = False  # Reset double jump au sol
             self.can_double_jump = False
         
         else:
             if self.vel_y < 0 and not self.is_jumping:
-                self.coyote_timer = self.COYOTE_FRAMES
+                self.coyote_timer = self.COYOTE_TIME
             self.is_jumping = True
         
         if self.jump_buffer_timer > 0:
-            self.jump_buffer_timer -= 1
-            if self.jump_buffer_timer == 0:
+            self.jump_buffer_timer -= dt
+            if self.jump_buffer_timer <= 0:
+                self.jump_buffer_timer = 0.0
                 self.jump_buffered = False
 
         return False  # Pas de mort
 
+    def get_state(self):
+        """Retourne une copie de l'état dynamique du joueur"""
+        state = {name: getattr(self, name) for name in self.STATE_FIELDS}
+        state["hitbox"] = tuple(self.hitbox)
+        return state
+
+    def set_state(self, state):
+        """Restaure un état obtenu par get_state (sans recharger l'image)"""
+        for name in self.STATE_FIELDS:
+            setattr(self, name, state[name])
+        self.hitbox.update(state["hitbox"])
+        self.prev_center = self.hitbox.center
+
     def collect_orb(self):
         """Active le double saut"""
         self.can_double_jump = True
         self.has_used_double_jump = False
 
-    def draw(self, screen, camera, is_invincible=False):
-        """Dessine le joueur avec rotation et clignotement"""
-        rotated_image = pygame.transform.rotate(self.image_originale, self.angle)
-        visual_rect = rotated_image.get_rect(center=self.hitbox.center)
+    def draw(self, screen, camera, is_invincible=False, alpha=1.0):
+        """
+        Dessine le joueur avec rotation et clignotement.
+        alpha : fraction du pas de simulation écoulée, pour interpoler la position.
+        """
+        prev_x, prev_y = self.prev_center
+        center = (round(self.hitbox.centerx * alpha + prev_x * (1.0 - alpha)),
+                  round(self.hitbox.centery * alpha + prev_y * (1.0 - alpha)))
+        
+        # Frame de l'atlas la plus proche de l'angle courant
+        frame = round(self.angle * self.ROTATION_STEPS / 360.0) % self.ROTATION_STEPS
+        rotated_image = self.rotation_atlas[frame]
+        visual_rect = rotated_image.get_rect(center=center)
         
         # Indicateur double saut disponible
         if self.can_double_jump and not self.has_used_double_jump:
-            aura = pygame.Surface((self.hitbox.w + 20, self.hitbox.h + 20), pygame.SRCALPHA)
-            pygame.draw.ellipse(aura, (0, 200, 255, 100), aura.get_rect())
-            screen.blit(aura, camera.apply(aura.get_rect(center=self.hitbox.center)))
+            aura = self.aura_image
+            screen.blit(aura, camera.apply(aura.get_rect(center=center)))
         
-        # Clignotement invincibilité
+        # Clignotement invincibilité : alpha de surface le temps du blit seulement,
+        # les frames de l'atlas sont partagées (ROTATION_ATLAS_CACHE)
         if is_invincible:
-            alpha = int(155 + 100 * abs(pygame.time.get_ticks() % 200 - 100) / 100)
-            rotated_image.set_alpha(alpha)
+            blink_alpha = int(155 + 100 * abs(pygame.time.get_ticks() % 200 - 100) / 100)
+            previous_alpha = rotated_image.get_alpha()
+            rotated_image.set_alpha(blink_alpha)
+            screen.blit(rotated_image, camera.apply(visual_rect))
+            rotated_image.set_alpha(previous_alpha)
         else:
-            rotated_image.set_alpha(255)
-        
-        screen.blit(rotated_image, camera.apply(visual_rect))
\ No newline at end of file
+            screen.blit(rotated_image, camera.apply(visual_rect))
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Profileur de frame : temps passé par étape (entrées, physique, dessin...),
+affiché en surimpression (p50/p99 glissants + graphe des temps de frame)
+et exportable image par image en CSV ou JSON.
+
+Désactivé, il ne coûte rien : Level.profiler vaut None et chaque point de
+mesure se résume à un test "is not None".
+
+Utilisation :
+    profiler.begin_frame()
+    ...                      # code non mesuré
+    profiler.mark()          # début d'une étape
+    ...
+    profiler.lap("physics")  # temps depuis mark/lap ajouté à "physics"
+    profiler.end_frame()
+Une étape peut être mesurée plusieurs fois par frame (plusieurs pas de
+simulation) : les temps sont additionnés.
+"""
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+import text_cache
+
+
+class FrameProfiler:
+    """Temps par étape de chaque frame, percentiles glissants et trace"""
+
+    # Étapes affichées, dans l'ordre de la frame ("other" = non mesuré)
+    STAGES = (
+        "input",
+        "physics", "particles", "orbs", "spikes",
+        "background", "parallax", "tiles", "sprites", "player",
+        "overlay", "other",
+    )
+
+    # Nombre de frames des percentiles et du graphe
+    WINDOW = 240
+
+    # Le texte de la surimpression est recalculé toutes les N frames
+    REFRESH_FRAMES = 15
+
+    # Budget d'une frame à 60 fps (ligne de repère du graphe)
+    BUDGET_MS = 1000 / 60
+
+    GRAPH_SIZE = (240, 60)
+
+    def __init__(self):
+        self.enabled = False
+        self.recording = False
+        self.trace = []
+
+        self.history = {stage: deque(maxlen=self.WINDOW) for stage in self.STAGES}
+        self.frame_times = deque(maxlen=self.WINDOW)
+
+        self.current = dict.fromkeys(self.STAGES, 0.0)
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.frame_index = 0
+
+        self.font = None
+        self.overlay = None
+
+    # ------------------------------------------------------------------ mesure
+
+    def begin_frame(self):
+        """Début d'une frame : remet les compteurs à zéro"""
+        for stage in self.current:
+            self.current[stage] = 0.0
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self):
+        """Début d'une étape (le temps écoulé depuis le dernier lap n'est pas compté)"""
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        """Ajoute le temps écoulé depuis le dernier mark/lap à une étape"""
+        now = time.perf_counter()
+        self.current[stage] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Fin de frame : historique glissant et trace si enregistrement"""
+        total = time.perf_counter() - self.frame_start
+        measured = sum(self.current[stage] for stage in self.STAGES if stage != "other")
+        self.current["other"] = max(0.0, total - measured)
+
+        for stage in self.STAGES:
+            self.history[stage].append(self.current[stage])
+        self.frame_times.append(total)
+
+        if self.recording:
+            row = {"frame": self.frame_index, "total_ms": total * 1000}
+            for stage in self.STAGES:
+                row[stage + "_ms"] = self.current[stage] * 1000
+            self.trace.append(row)
+
+        self.frame_index += 1
+        if self.frame_index % self.REFRESH_FRAMES == 0:
+            self.overlay = None
+
+    # ------------------------------------------------------------ statistiques
+
+    @staticmethod
+    def percentile(values, fraction):
+        """Percentile (plus proche rang) d'une liste de valeurs"""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+    def summary(self):
+        """{étape: (p50 ms, p99 ms)} sur la fenêtre glissante, "frame" compris"""
+        stats = {"frame": (self.percentile(self.frame_times, 0.5) * 1000,
+                           self.percentile(self.frame_times, 0.99) * 1000)}
+        for stage in self.STAGES:
+            values = self.history[stage]
+            stats[stage] = (self.percentile(values, 0.5) * 1000,
+                            self.percentile(values, 0.99) * 1000)
+        return stats
+
+    # ------------------------------------------------------------------- trace
+
+    def start_recording(self):
+        self.trace = []
+        self.recording = True
+
+    def stop_recording(self, path):
+        """Arrête l'enregistrement et écrit la trace, retourne le chemin ou None"""
+        self.recording = False
+        if not self.trace:
+            return None
+        self.dump(path)
+        self.trace = []
+        return path
+
+    def dump(self, path):
+        """Écrit la trace image par image (CSV ou JSON selon l'extension)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"stages": list(self.STAGES), "frames": self.trace}, f)
+            return
+
+        fields = ["frame", "total_ms"] + [stage + "_ms" for stage in self.STAGES]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.trace)
+
+    # ---------------------------------------------------------- surimpression
+
+    def draw(self, screen):
+        """Dessine la surimpression (reconstruite toutes les REFRESH_FRAMES frames)"""
+        if self.overlay is None:
+            self.overlay = self._build_overlay()
+        screen.blit(self.overlay, (10, 10))
+
+    def _build_overlay(self):
+        if self.font is None:
+            self.font = text_cache.get_font(14, bold=True, name="consolas,couriernew,dejavusansmono")
+
+        lines = [f"{'étape':<11}{'p50':>7}{'p99':>7}  ms"]
+        for stage, (p50, p99) in self.summary().items():
+            lines.append(f"{stage:<11}{p50:>7.2f}{p99:>7.2f}")
+        if self.recording:
+            lines.append(f"REC {len(self.trace)} frames")
+
+        line_height = self.font.get_linesize()
+        graph_w, graph_h = self.GRAPH_SIZE
+        width = max(graph_w, max(self.font.size(line)[0] for line in lines)) + 16
+        height = line_height * len(lines) + graph_h + 24
+
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            color = (255, 80, 80) if line.startswith("REC") else (230, 230, 230)
+            overlay.blit(self.font.render(line, True, color), (8, 8 + i * line_height))
+
+        self._draw_graph(overlay, pygame.Rect(8, height - graph_h - 8, graph_w, graph_h))
+        return overlay
+
+    def _draw_graph(self, surface, area):
+        """Graphe des temps de frame, échelle 0 - 2 x budget"""
+        pygame.draw.rect(surface, (40, 40, 40, 200), area)
+        scale = area.height / (2 * self.BUDGET_MS)
+
+        budget_y = area.bottom - int(self.BUDGET_MS * scale)
+        pygame.draw.line(surface, (90, 200, 90), (area.left, budget_y), (area.right - 1, budget_y))
+
+        times = list(self.frame_times)
+        if len(times) < 2:
+            return
+        step = area.width / (self.WINDOW - 1)
+        points = [
+            (area.left + int(i * step),
+             max(area.top, area.bottom - 1 - int(t * 1000 * scale)))
+            for i, t in enumerate(times)
+        ]
+        pygame.draw.lines(surface, (255, 200, 0), False, points)
@@ -0,0 +1,238 @@
+"""
+Enregistrement et relecture des tentatives (fichiers .gdr).
+
+Une tentative est la suite des états de ESPACE à chaque pas de simulation
+(Level.SIM_DT), depuis le reset du niveau jusqu'à la mort, l'arrivée ou
+l'abandon. La simulation étant déterministe, la rejouer avec les mêmes
+entrées reproduit exactement la même partie : l'état final enregistré
+(position et vitesse du joueur) est comparé à l'identique.
+
+Format (petit-boutiste) :
+    en-tête : magic, version, sim_hz, invincibilité de départ, ticks,
+              issue, état final (x, y, pos_y, vel_y), crc du niveau,
+              longueur du nom du niveau, nombre de changements
+    nom     : nom du fichier de niveau (utf-8)
+    entrées : ticks où ESPACE change d'état (appui, relâchement, ...),
+              en écarts successifs codés en varint
+"""
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+from level import Level
+
+MAGIC = b"GDRP"
+VERSION = 1
+REPLAY_EXTENSION = ".gdr"
+
+OUTCOMES = ("died", "completed", "interrupted")
+
+_HEADER = struct.Struct("<4sHHdIBiiddIHI")
+
+# Résultat d'une relecture (identical : issue, ticks et état final identiques)
+PlaybackResult = namedtuple("PlaybackResult", "outcome ticks identical")
+
+
+def level_crc(level_path):
+    """Empreinte du fichier de niveau (un replay ne vaut que pour ce niveau)"""
+    try:
+        with open(level_path, "rb") as f:
+            return zlib.crc32(f.read())
+    except OSError:
+        return 0
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """Une tentative enregistrée"""
+
+    def __init__(self, level_name, crc, start_invincibility, edges, ticks, outcome, final_state,
+                 sim_hz=Level.SIM_HZ):
+        self.level_name = level_name
+        self.crc = crc
+        self.sim_hz = sim_hz
+        self.start_invincibility = start_invincibility
+        self.edges = edges
+        self.ticks = ticks
+        self.outcome = outcome
+        self.final_state = final_state
+
+    def held_ranges(self):
+        """Intervalles [début, fin) de ticks pendant lesquels ESPACE est enfoncée"""
+        edges = self.edges + [self.ticks] if len(self.edges) % 2 else self.edges
+        return [(edges[i], edges[i + 1]) for i in range(0, len(edges), 2)]
+
+    def input_sequence(self):
+        """Séquence d'entrées tick -> bool (même forme que headless.script_input)"""
+        held = set()
+        for start, end in self.held_ranges():
+            held.update(range(start, end))
+        return held.__contains__
+
+    def save(self, path):
+        x, y, pos_y, vel_y = self.final_state
+        name = self.level_name.encode("utf-8")
+
+        entries = bytearray()
+        previous = 0
+        for tick in self.edges:
+            _write_varint(entries, tick - previous)
+            previous = tick
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.sim_hz, self.start_invincibility,
+                                 self.ticks, OUTCOMES.index(self.outcome),
+                                 x, y, pos_y, vel_y, self.crc, len(name), len(self.edges)))
+            f.write(name)
+            f.write(entries)
+
+    @classmethod
+    def load(cls, path):
+        """Charge un replay, lève ValueError si le fichier est invalide"""
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{path} : fichier tronqué")
+        (magic, version, sim_hz, start_invincibility, ticks, outcome,
+         x, y, pos_y, vel_y, crc, name_len, edge_count) = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} : format {magic!r} v{version} non supporté")
+
+        offset = _HEADER.size
+        level_name = data[offset:offset + name_len].decode("utf-8")
+        offset += name_len
+
+        edges = []
+        tick = 0
+        try:
+            for _ in range(edge_count):
+                delta, offset = _read_varint(data, offset)
+                tick += delta
+                edges.append(tick)
+        except IndexError:
+            raise ValueError(f"{path} : entrées tronquées") from None
+
+        return cls(level_name, crc, start_invincibility, edges, ticks, OUTCOMES[outcome],
+                   (x, y, pos_y, vel_y), sim_hz)
+
+
+def final_state(level):
+    """État comparé à l'identique en fin de relecture"""
+    player = level.player
+    return (player.hitbox.x, player.hitbox.y, player.pos_y_float, player.vel_y)
+
+
+class ReplayRecorder:
+    """
+    Enregistre chaque tentative de main.py dans directory (un fichier par
+    tentative, les plus anciens au-delà de MAX_REPLAYS sont supprimés).
+    """
+
+    MAX_REPLAYS = 100
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.level = None
+        self.start_invincibility = 0.0
+        self.edges = []
+        self.tick = 0
+        self.pressed = False
+
+    def start(self, level):
+        """Début d'une tentative (niveau tout juste créé ou remis à zéro)"""
+        self.level = level
+        self.start_invincibility = level.respawn_invincibility
+        self.edges = []
+        self.tick = 0
+        self.pressed = False
+
+    def record(self, pressed):
+        """État de ESPACE pour le pas de simulation courant"""
+        if pressed != self.pressed:
+            self.edges.append(self.tick)
+            self.pressed = pressed
+        self.tick += 1
+
+    def finish(self, outcome):
+        """Fin de tentative : écrit le replay, retourne son chemin (None si rien à écrire)"""
+        level = self.level
+        if level is None or self.tick == 0:
+            return None
+        self.level = None
+
+        level_name = os.path.basename(level.level_path)
+        replay = Replay(level_name, level_crc(level.level_path), self.start_invincibility,
+                        self.edges, self.tick, outcome, final_state(level))
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.directory, f"{os.path.splitext(level_name)[0]}_{stamp}")
+        path = base + REPLAY_EXTENSION
+        index = 1
+        while os.path.exists(path):
+            index += 1
+            path = f"{base}_{index}{REPLAY_EXTENSION}"
+        replay.save(path)
+
+        self._prune()
+        return path
+
+    def _prune(self):
+        files = [os.path.join(self.directory, f) for f in os.listdir(self.directory)
+                 if f.endswith(REPLAY_EXTENSION)]
+        if len(files) <= self.MAX_REPLAYS:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.MAX_REPLAYS]:
+            os.remove(path)
+
+
+def play(level, replay):
+    """
+    Rejoue un replay depuis le reset du niveau, dans le même ordre que la
+    boucle de main.py (entrée puis Level.update), retourne un PlaybackResult.
+    """
+    if replay.sim_hz != Level.SIM_HZ:
+        raise ValueError(f"replay enregistré à {replay.sim_hz} Hz, simulation à {Level.SIM_HZ} Hz")
+
+    level.reset()
+    # La première tentative d'un Level tout juste créé part sans invincibilité
+    level.respawn_invincibility = replay.start_invincibility
+
+    is_pressed = replay.input_sequence()
+    player = level.player
+    outcome = "interrupted"
+    ticks = replay.ticks
+    for tick in range(replay.ticks):
+        if is_pressed(tick):
+            player.jump()
+
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_dead or is_completed:
+            outcome = "completed" if is_completed else "died"
+            ticks = tick + 1
+            break
+
+    identical = (outcome == replay.outcome and ticks == replay.ticks
+                 and final_state(level) == replay.final_state)
+    return PlaybackResult(outcome, ticks, identical)
@@ -0,0 +1,20 @@
+"""
+Configuration commune des tests : pygame sans fenêtre ni son, modules du
+projet importables et chemins relatifs (levels/, assets/) résolus depuis
+la racine du projet, comme pour les outils de tools/.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def project_root(monkeypatch):
+    monkeypatch.chdir(ROOT)
@@ -0,0 +1,81 @@
+"""AssetCache : ordre d'éviction LRU et comptage des octets"""
+import pygame
+
+import transform_cache
+from asset_cache import AssetCache, surface_bytes
+
+
+def surface(width=16, height=16):
+    return pygame.Surface((width, height))
+
+
+def test_least_recently_used_is_evicted_first():
+    a, b, c, d = surface(), surface(), surface(), surface()
+    cache = AssetCache(3 * surface_bytes(a))
+    cache.put("a", a)
+    cache.put("b", b)
+    cache.put("c", c)
+
+    # "a" redevient la plus récente : "b" part en premier
+    assert cache.get("a") is a
+    cache.put("d", d)
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.evictions == 1
+
+
+def test_bytes_follow_puts_replacements_and_evictions():
+    small, large = surface(8, 8), surface(32, 32)
+    cache = AssetCache(surface_bytes(large) + surface_bytes(small))
+    cache.put("small", small)
+    cache.put("large", large)
+    assert cache.bytes == surface_bytes(small) + surface_bytes(large)
+
+    # Remplacement : l'ancienne surface ne compte plus
+    cache.put("small", surface(4, 4))
+    assert cache.bytes == surface_bytes(surface(4, 4)) + surface_bytes(large)
+
+    # Dépassement : le remplacement a rafraîchi "small", "large" part
+    other = cache.put("other", surface(32, 32))
+    assert list(cache.entries) == ["small", "other"]
+    assert cache.bytes == surface_bytes(surface(4, 4)) + surface_bytes(other) <= cache.budget_bytes
+
+
+def test_oversized_entry_is_kept_alone():
+    cache = AssetCache(10)
+    cache.put("a", surface())
+    big = cache.put("big", surface(64, 64))
+    assert list(cache.entries) == ["big"]
+    assert cache.get("big") is big
+    assert cache.bytes == surface_bytes(big)
+
+
+def test_stats_and_peek():
+    cache = AssetCache()
+    a = cache.put("a", surface())
+    cache.put("b", surface())
+    assert cache.get("missing") is None
+    assert cache.get("a") is a
+
+    # peek : ni statistiques ni ordre LRU
+    assert cache.peek("b") is not None
+    assert list(cache.entries) == ["b", "a"]
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_scaled_variants_share_the_budget():
+    source = surface(32, 32)
+    cache = AssetCache(surface_bytes(source) + surface_bytes(surface(16, 16)))
+    cache.put(("default", "block"), source)
+
+    variant = transform_cache.scale(cache, ("default", "block"), source, (16, 16))
+    assert cache.peek(("default", "block", (16, 16), False)) is variant
+    assert transform_cache.scale(cache, ("default", "block"), source, (16, 16)) is variant
+    assert cache.bytes == surface_bytes(source) + surface_bytes(variant)
+
+    # Source évincée : ses variantes ne sont plus mises en cache
+    cache.put(("default", "spike"), surface(32, 32))
+    assert ("default", "block") not in cache
+    transform_cache.scale(cache, ("default", "block"), source, (8, 8))
+    assert ("default", "block", (8, 8), False) not in cache
@@ -0,0 +1,66 @@
+"""Broad-phase par colonnes : mêmes collisions que le parcours complet du niveau"""
+import pygame
+import pytest
+
+import headless
+from level import Level
+
+LEVEL1 = "levels/level1.json"
+LEVEL1_SCRIPT = "levels/inputs/level1.json"
+
+
+def full_scan(group, rect, rect_of):
+    """Ancien test de collision : tous les objets du niveau, dans l'ordre du groupe"""
+    return [obj for obj in group if rect.colliderect(rect_of(obj))]
+
+
+def indexed(index, rect, rect_of):
+    return [obj for obj in index.query(rect) if rect.colliderect(rect_of(obj))]
+
+
+def level1_query_rects():
+    """Rects réellement passés aux index pendant une tentative complète de level1"""
+    level = headless.load_level(LEVEL1, streaming=False)
+    rects = []
+    for index in (level.platform_index, level.spike_index, level.orb_index, level.flag_index):
+        def recording_query(rect, query=index.query):
+            rects.append(rect.copy())
+            return query(rect)
+        index.query = recording_query
+    headless.run_attempt(level, headless.load_script(LEVEL1_SCRIPT))
+    for index in (level.platform_index, level.spike_index, level.orb_index, level.flag_index):
+        del index.query
+    return level, rects
+
+
+def test_query_matches_full_scan_along_level1():
+    level, played = level1_query_rects()
+    # Rects des requêtes pendant la partie, puis une grille qui couvre tout le niveau
+    # (rects à cheval sur plusieurs colonnes et hors du niveau compris)
+    tile = level.tile_size
+    rects = played + [pygame.Rect(x, y, w, w)
+                        for x in range(-tile, level.level_end_x + tile, tile // 3)
+                        for y in range(0, 8 * tile, tile // 2)
+                        for w in (1, tile // 2, tile + 7)]
+
+    checks = [
+        (level.platforms, level.platform_index, lambda p: p.rect),
+        (level.spikes, level.spike_index, lambda s: s.hitbox),
+        (level.orbs, level.orb_index, lambda o: o.hitbox),
+        (level.finish_flags, level.flag_index, lambda f: f.rect),
+    ]
+    for rect in rects:
+        for group, index, rect_of in checks:
+            assert indexed(index, rect, rect_of) == full_scan(group, rect, rect_of), rect
+
+
+@pytest.mark.parametrize("script", [LEVEL1_SCRIPT, None])
+def test_streaming_keeps_the_same_final_state(script):
+    # Tentative réussie (script enregistré) et mort sans aucun saut
+    is_pressed = headless.load_script(script) if script else (lambda tick: False)
+    states = []
+    for streaming in (False, True):
+        level = headless.load_level(LEVEL1, streaming=streaming)
+        result = headless.run_attempt(level, is_pressed)
+        states.append((result, level.player.get_state()))
+    assert states[0] == states[1]
@@ -0,0 +1,68 @@
+"""Format de niveau compilé (.gdl) : mêmes objets que le JSON, fraîcheur du fichier"""
+import json
+import os
+import shutil
+
+import pytest
+
+import level_format
+
+LEVEL1 = "levels/level1.json"
+
+
+def load_source(path=LEVEL1):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_compiled_tiles_match_json(tmp_path):
+    source = load_source()
+    data = level_format.load_compiled(level_format.compile_level(LEVEL1, str(tmp_path / "level1.gdl")))
+
+    grid = data["grid"]
+    layout = level_format.JsonLayout(source["layout"])
+    assert (grid.rows, grid.columns, grid.width) == (layout.rows, layout.columns, layout.width)
+    assert list(grid.tiles()) == list(layout.tiles())
+
+    # Métadonnées : tout le JSON sauf le layout
+    assert data["tile_size"] == source["tile_size"]
+    for key, value in source.items():
+        if key not in ("layout", "tile_size"):
+            assert data[key] == value
+
+
+@pytest.mark.parametrize("first_col, last_col", [(0, 1), (0, 10), (7, 23), (40, 1000)])
+def test_compiled_column_range_matches_json(tmp_path, first_col, last_col):
+    layout = level_format.JsonLayout(load_source()["layout"])
+    grid = level_format.load_compiled(level_format.compile_level(LEVEL1, str(tmp_path / "level1.gdl")))["grid"]
+    assert list(grid.tiles_in_columns(first_col, last_col)) == list(layout.tiles_in_columns(first_col, last_col))
+
+
+def test_is_fresh_follows_modification_times(tmp_path):
+    source = tmp_path / "level1.json"
+    compiled = tmp_path / "level1.gdl"
+    shutil.copy(LEVEL1, source)
+    assert not level_format.is_fresh(str(compiled), str(source))
+
+    level_format.compile_level(str(source), str(compiled))
+    os.utime(source, (1000, 1000))
+    os.utime(compiled, (2000, 2000))
+    assert level_format.is_fresh(str(compiled), str(source))
+
+    # JSON modifié après la compilation
+    os.utime(source, (3000, 3000))
+    assert not level_format.is_fresh(str(compiled), str(source))
+
+    # Niveau distribué sans son JSON
+    source.unlink()
+    assert level_format.is_fresh(str(compiled), str(source))
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    compiled = level_format.compile_level(LEVEL1, str(tmp_path / "level1.gdl"))
+    with open(compiled, "rb") as f:
+        data = f.read()
+    with open(compiled, "wb") as f:
+        f.write(data[:-1])
+    with pytest.raises(ValueError):
+        level_format.load_compiled(compiled)
@@ -0,0 +1,66 @@
+"""Replays (.gdr) : encodage sans perte et relecture à l'identique de l'état final"""
+import json
+
+import headless
+import replay
+from level import Level
+
+LEVEL1 = "levels/level1.json"
+LEVEL1_SCRIPT = "levels/inputs/level1.json"
+
+
+def record_level1(directory):
+    """Tentative de level1 enregistrée comme dans main.py (entrée, saut, update)"""
+    level = headless.load_level(LEVEL1)
+    recorder = replay.ReplayRecorder(str(directory))
+    recorder.start(level)
+    is_pressed = headless.load_script(LEVEL1_SCRIPT)
+    outcome = "interrupted"
+    for tick in range(headless.max_ticks_for(level)):
+        pressed = is_pressed(tick)
+        recorder.record(pressed)
+        if pressed:
+            level.player.jump()
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_dead or is_completed:
+            outcome = "completed" if is_completed else "died"
+            break
+    return level, recorder.finish(outcome)
+
+
+def test_save_load_roundtrip(tmp_path):
+    level, path = record_level1(tmp_path)
+    loaded = replay.Replay.load(path)
+
+    assert loaded.level_name == "level1.json"
+    assert loaded.crc == replay.level_crc(LEVEL1)
+    assert loaded.sim_hz == Level.SIM_HZ
+    assert loaded.outcome == "completed"
+    assert loaded.final_state == replay.final_state(level)
+    with open(LEVEL1_SCRIPT) as f:
+        script = json.load(f)
+    assert loaded.held_ranges() == [tuple(held) for held in script["held"]]
+
+
+def test_playback_reaches_recorded_final_state(tmp_path):
+    _, path = record_level1(tmp_path)
+    loaded = replay.Replay.load(path)
+
+    result = replay.play(headless.load_level(LEVEL1), loaded)
+    assert result.outcome == "completed"
+    assert result.ticks == loaded.ticks
+    assert result.identical
+
+
+def test_edges_roundtrip_with_large_gaps(tmp_path):
+    # Écarts sur plusieurs octets de varint, ESPACE encore enfoncée à la fin
+    original = replay.Replay("level1.json", 1234, 0.5, [0, 1, 200, 70_000, 2_000_000], 2_000_010,
+                             "interrupted", (10, 20, 20.5, -3.25))
+    path = tmp_path / "edges.gdr"
+    original.save(str(path))
+    loaded = replay.Replay.load(str(path))
+
+    assert loaded.edges == original.edges
+    assert loaded.held_ranges() == [(0, 1), (200, 70_000), (2_000_000, 2_000_010)]
+    assert (loaded.crc, loaded.start_invincibility, loaded.ticks, loaded.outcome, loaded.final_state) == \
+        (1234, 0.5, 2_000_010, "interrupted", (10, 20, 20.5, -3.25))
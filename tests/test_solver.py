@@ -0,0 +1,33 @@
+"""Le solveur et le script d'entrées de level1 doivent toujours terminer le niveau"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import headless
+from tools import solver
+
+LEVEL1 = "levels/level1.json"
+LEVEL1_SCRIPT = "levels/inputs/level1.json"
+
+
+def test_level1_script_completes_in_expected_ticks():
+    with open(LEVEL1_SCRIPT) as f:
+        script = json.load(f)
+    result = headless.run_attempt(headless.load_level(LEVEL1), headless.load_script(LEVEL1_SCRIPT))
+    assert result.completed
+    assert result.ticks == script["expect"]["ticks"]
+
+
+def test_solver_solution_completes_level1():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        presses, windows, _ = solver.solve(LEVEL1, pool, 2)
+    assert presses is not None
+    assert all(low <= 0 <= high for low, high in windows)
+
+    level = headless.load_level(LEVEL1)
+    result = headless.run_attempt(level, solver.held_ticks(presses).__contains__)
+    assert result.completed
+
+    # Le script enregistré est celui du solveur (régénéré après tout changement de physique)
+    with open(LEVEL1_SCRIPT) as f:
+        held = json.load(f)["held"]
+    assert [start for start, _ in held] == presses
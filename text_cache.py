@@ -0,0 +1,38 @@
+"""
+Polices et textes rendus, partagés par les menus et le HUD.
+
+get_font garde une police par (nom, taille, gras) : SysFont cherche la
+police dans le système à chaque appel, on ne le fait qu'une fois.
+render garde les surfaces de texte par (nom, taille, gras, texte,
+couleur) dans un LRU borné (asset_cache.AssetCache) : un menu qui
+réaffiche les mêmes libellés ne rastérise plus rien. Les surfaces
+retournées sont partagées et ne doivent pas être modifiées.
+"""
+import pygame
+
+from asset_cache import AssetCache
+
+DEFAULT_FONT = "Arial"
+
+# Budget des textes rendus (quelques centaines de libellés)
+TEXT_BUDGET_BYTES = 4 * 1024 * 1024
+
+# Polices : (nom, taille, gras) -> Font
+FONTS = {}
+
+TEXT_CACHE = AssetCache(TEXT_BUDGET_BYTES)
+
+
+def get_font(size, bold=False, name=DEFAULT_FONT):
+    """Police système partagée (créée au premier appel)"""
+    key = (name, size, bold)
+    font = FONTS.get(key)
+    if font is None:
+        font = FONTS[key] = pygame.font.SysFont(name, size, bold=bold)
+    return font
+
+
+def render(text, size, color, bold=False, name=DEFAULT_FONT):
+    """Texte antialiasé rendu une seule fois tant qu'il reste dans le cache"""
+    key = (name, size, bold, text, tuple(color))
+    return TEXT_CACHE.get_or_create(key, lambda: get_font(size, bold, name).render(text, True, color))
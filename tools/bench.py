@@ -0,0 +1,314 @@
+"""
+Benchmarks reproductibles du moteur (level.py, player.py, objects.py).
+
+Génère des niveaux synthétiques de 1k, 10k et 100k colonnes à deux
+densités de pics/plateformes (graine fixe), puis mesure pour chacun :
+    load_ms        construction de Level
+    reset_us       Level.reset
+    update_tps     pas de simulation par seconde (jeu complet, particules comprises)
+    headless_tps   pas de simulation par seconde en headless
+    draw_fps       Level.draw par seconde sur une surface hors écran
+    peak_rss_kb    hausse du pic de mémoire résidente (RSS) pendant chargement,
+                   simulation et rendu, mesurée dans un processus neuf : compte
+                   aussi la mémoire de SDL (surfaces), invisible pour tracemalloc
+                   (0 sans le module resource, sous Windows)
+
+Le joueur est invincible pendant les mesures (la caméra avance au lieu de
+recommencer au premier pic) et saute à intervalle régulier.
+
+Les résultats sont écrits en JSON ; avec --baseline, chaque mesure est
+comparée au fichier de référence et l'écart au-delà de --tolerance est
+signalé comme régression (code de sortie 1).
+
+Usage (depuis la racine du projet) :
+    python -m tools.bench [--output bench_results.json] [--baseline bench_baseline.json]
+                          [--sizes 1000,10000] [--tolerance 0.15]
+"""
+import os
+import sys
+import gc
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import headless
+from level import Level
+from asset_cache import AssetCache
+
+SCREEN_SIZE = headless.SCREEN_SIZE
+
+SIZES = (1_000, 10_000, 100_000)
+
+# Densités : (part de colonnes avec un pic, part avec une plateforme)
+DENSITIES = {
+    "sparse": (0.05, 0.05),
+    "dense": (0.25, 0.20),
+}
+
+SEED = 1234
+
+# Longueur des mesures
+UPDATE_TICKS = Level.SIM_HZ * 20
+DRAW_FRAMES = 600
+RESET_REPEAT = 200
+
+# Chaque mesure de temps est répétée, le meilleur résultat est gardé
+# (le moins perturbé par le reste du système)
+REPEAT = 5
+
+# Appui de 4 ticks toutes les demi-secondes
+JUMP_PERIOD = Level.SIM_HZ // 2
+JUMP_HELD = 4
+
+# Sens de chaque mesure : +1 plus grand = mieux, -1 plus petit = mieux
+METRICS = {
+    "load_ms": -1,
+    "reset_us": -1,
+    "update_tps": +1,
+    "headless_tps": +1,
+    "draw_fps": +1,
+    "peak_rss_kb": -1,
+}
+
+
+def generate_layout(columns, spike_ratio, platform_ratio, seed=SEED):
+    """Layout ASCII de 8 lignes : sol continu, pics, plateformes, orbs et arrivée"""
+    rng = random.Random(seed)
+    rows = [[" "] * columns for _ in range(8)]
+    rows[7] = ["="] * columns
+
+    # Départ dégagé, puis décor aléatoire
+    for col in range(12, columns - 2):
+        roll = rng.random()
+        if roll < spike_ratio:
+            rows[6][col] = "S"
+        elif roll < spike_ratio + platform_ratio:
+            rows[5][col] = "P"
+            if rng.random() < 0.1:
+                rows[4][col] = "O"
+    rows[6][columns - 1] = "F"
+    return ["".join(row) for row in rows]
+
+
+def write_level(directory, name, columns, density):
+    spike_ratio, platform_ratio = DENSITIES[density]
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "tile_size": 75,
+            "theme_folder": "default",
+            "layout": generate_layout(columns, spike_ratio, platform_ratio),
+        }, f)
+    return path
+
+
+def is_pressed(tick):
+    return tick % JUMP_PERIOD < JUMP_HELD
+
+
+def run_ticks(level, ticks):
+    """Fait avancer le niveau (joueur invincible), retourne les pas par seconde"""
+    level.reset()
+    player = level.player
+    start = time.perf_counter()
+    for tick in range(ticks):
+        level.respawn_invincibility = 1.0
+        if is_pressed(tick):
+            player.jump()
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_dead or is_completed:
+            level.reset()
+    return ticks / (time.perf_counter() - start)
+
+
+def run_draw(level, screen, frames):
+    """Dessine frames images (4 pas de simulation entre chaque), retourne les images par seconde"""
+    level.reset()
+    steps = Level.SIM_HZ // 60
+    elapsed = 0.0
+    tick = 0
+    for _ in range(frames):
+        for _ in range(steps):
+            level.respawn_invincibility = 1.0
+            if is_pressed(tick):
+                level.player.jump()
+            is_dead, is_completed = level.update(Level.SIM_DT)
+            if is_dead or is_completed:
+                level.reset()
+            tick += 1
+        start = time.perf_counter()
+        level.draw(screen, SCREEN_SIZE[0])
+        elapsed += time.perf_counter() - start
+    return frames / elapsed
+
+
+def setup_display():
+    """Fenêtre minimale (convert_alpha), surface de rendu et fond des mesures"""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    screen = pygame.Surface(SCREEN_SIZE)
+    background = pygame.Surface(SCREEN_SIZE)
+    background.fill((20, 20, 40))
+    return screen, background
+
+
+def peak_rss_kb():
+    """
+    Pic de mémoire résidente du processus depuis son démarrage (kio).
+    Sous Linux, VmHWM : ru_maxrss y hérite du pic du processus parent.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kio sous Linux
+    return peak / 1024 if sys.platform == "darwin" else float(peak)
+
+
+def rss_case(path):
+    """
+    Exécuté dans un processus neuf : le pic RSS ne redescend jamais, il
+    doit partir du processus à vide (pygame initialisé) pour chaque niveau.
+    """
+    screen, background = setup_display()
+    before = peak_rss_kb()
+    level = Level(path, background, AssetCache(), *SCREEN_SIZE)
+    run_ticks(level, UPDATE_TICKS)
+    run_draw(level, screen, DRAW_FRAMES)
+    return peak_rss_kb() - before
+
+
+def bench_case(path, background, screen):
+    """Toutes les mesures d'un niveau"""
+    results = {}
+
+    load_times = []
+    for _ in range(REPEAT):
+        level = None
+        gc.collect()
+        start = time.perf_counter()
+        level = Level(path, background, AssetCache(), *SCREEN_SIZE)
+        load_times.append((time.perf_counter() - start) * 1000)
+    results["load_ms"] = min(load_times)
+
+    reset_times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(RESET_REPEAT):
+            level.reset()
+        reset_times.append((time.perf_counter() - start) * 1e6 / RESET_REPEAT)
+    results["reset_us"] = min(reset_times)
+
+    results["update_tps"] = max(run_ticks(level, UPDATE_TICKS) for _ in range(REPEAT))
+    results["draw_fps"] = max(run_draw(level, screen, DRAW_FRAMES) for _ in range(REPEAT))
+    del level
+
+    level = headless.load_level(path)
+    results["headless_tps"] = max(run_ticks(level, UPDATE_TICKS) for _ in range(REPEAT))
+    del level
+
+    # Mesure mémoire dans un processus neuf (spawn : rien d'hérité de celui-ci)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        results["peak_rss_kb"] = pool.submit(rss_case, path).result()
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Affiche l'écart à la référence, retourne le nombre de régressions"""
+    regressions = 0
+    for case, metrics in results["cases"].items():
+        reference = baseline.get("cases", {}).get(case)
+        if reference is None:
+            print(f"   {case} : absent de la référence")
+            continue
+        for metric, direction in METRICS.items():
+            if metric not in reference or not reference[metric]:
+                continue
+            change = (metrics[metric] - reference[metric]) / reference[metric]
+            worse = -change * direction > tolerance
+            regressions += worse
+            mark = "❌" if worse else "  "
+            print(f"{mark} {case:<16}{metric:<15}{reference[metric]:>12.2f} -> {metrics[metric]:>12.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du moteur sur des niveaux synthétiques")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="résultats de référence à comparer")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="longueurs en colonnes, séparées par des virgules")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="écart relatif toléré avant de signaler une régression")
+    args = parser.parse_args()
+
+    screen, background = setup_display()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "sim_hz": Level.SIM_HZ,
+            "seed": SEED,
+        },
+        "cases": {},
+    }
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    with tempfile.TemporaryDirectory() as directory:
+        # Échauffement : images du thème et caches partagés chargés hors mesure
+        bench_case(write_level(directory, "warmup", 100, "sparse"), background, screen)
+
+    print(f"{'cas':<16}" + "".join(f"{metric:>15}" for metric in METRICS))
+    with tempfile.TemporaryDirectory() as directory:
+        for columns in sizes:
+            for density in DENSITIES:
+                name = f"{columns // 1000}k_{density}" if columns >= 1000 else f"{columns}_{density}"
+                path = write_level(directory, name, columns, density)
+                metrics = bench_case(path, background, screen)
+                results["cases"][name] = metrics
+                print(f"{name:<16}" + "".join(f"{metrics[metric]:>15.2f}" for metric in METRICS))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"💾 Résultats écrits : {args.output}")
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nComparaison avec {args.baseline} (tolérance {args.tolerance:.0%})")
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"{'❌' if regressions else '✅'} {regressions} régression(s)")
+
+    pygame.quit()
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark du dessin du fond : mise à l'échelle à chaque frame (ancien
+Level.draw) contre le cache de rendu par taille d'écran (Level._get_render_cache).
+
+Usage (depuis la racine du projet) :
+    python -m tools.bench_background [levels/level1.json] [--frames 500]
+"""
+import os
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from level import Level
+from asset_cache import AssetCache
+
+SCREEN_SIZE = (1000, 600)
+
+
+def time_frames(draw, frames):
+    """Temps moyen par frame (ms) d'une fonction de dessin"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("level", nargs="?", default=os.path.join("levels", "level1.json"))
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    background = pygame.image.load(os.path.join("assets", "background.png")).convert()
+    level = Level(args.level, background, AssetCache(), *SCREEN_SIZE)
+
+    def draw_uncached():
+        # Ancien chemin : fond redimensionné à chaque frame
+        screen.blit(pygame.transform.scale(level.bg_image, screen.get_size()), (0, 0))
+        level._draw_parallax(screen, SCREEN_SIZE[0], level._get_render_cache(screen.get_size())["parallax"])
+
+    def draw_cached():
+        render_cache = level._get_render_cache(screen.get_size())
+        screen.blit(render_cache["background"], (0, 0))
+        level._draw_parallax(screen, SCREEN_SIZE[0], render_cache["parallax"])
+
+    uncached = time_frames(draw_uncached, args.frames)
+    cached = time_frames(draw_cached, args.frames)
+
+    print(f"fond + parallaxe, {args.frames} frames ({SCREEN_SIZE[0]}x{SCREEN_SIZE[1]})")
+    print(f"  sans cache : {uncached:.3f} ms/frame")
+    print(f"  avec cache : {cached:.3f} ms/frame")
+    print(f"  gain       : {uncached - cached:.3f} ms/frame (x{uncached / cached:.1f})")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Compile les niveaux JSON en fichiers binaires .gdl (voir level_format.py).
+Level charge automatiquement le .gdl quand il est plus récent que le JSON.
+
+Usage (depuis la racine du projet) :
+    python -m tools.compile_levels [levels/level1.json ...]
+"""
+import os
+import sys
+import glob
+import time
+
+import level_format
+
+
+def main(paths):
+    if not paths:
+        paths = sorted(glob.glob(os.path.join("levels", "level*.json")))
+
+    for path in paths:
+        start = time.perf_counter()
+        destination = level_format.compile_level(path)
+        elapsed = (time.perf_counter() - start) * 1000
+        size = os.path.getsize(destination)
+        print(f"✅ {path} -> {destination} ({size} octets, {elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
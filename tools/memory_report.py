@@ -0,0 +1,67 @@
+"""
+Rapport mémoire des tuiles : empreinte en pixels des plateformes et pics
+de chaque niveau livré, avec copies par tuile (avant) et surfaces
+partagées (flyweight, après).
+
+Usage (depuis la racine du projet) :
+    python -m tools.memory_report [levels/level1.json ...]
+"""
+import os
+import sys
+import glob
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import objects
+from level import Level
+from asset_cache import AssetCache, surface_bytes
+
+SCREEN_SIZE = (1000, 600)
+
+
+def tile_footprint(level):
+    """Retourne (nombre de tuiles, octets de pixels uniques) pour un niveau"""
+    surfaces = {}
+    count = 0
+    for sprite in list(level.platforms) + list(level.spikes):
+        surfaces[id(sprite.image)] = sprite.image
+        count += 1
+    return count, sum(surface_bytes(s) for s in surfaces.values())
+
+
+def measure(level_path, shared):
+    """Construit le niveau dans le mode demandé et mesure ses tuiles"""
+    objects.SHARED_TILE_IMAGES = shared
+    background = pygame.Surface(SCREEN_SIZE)
+    level = Level(level_path, background, AssetCache(), *SCREEN_SIZE)
+    return tile_footprint(level)
+
+
+def main(paths):
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+
+    if not paths:
+        paths = sorted(glob.glob(os.path.join("levels", "level*.json")))
+
+    previous_mode = objects.SHARED_TILE_IMAGES
+    total_before = total_after = 0
+    try:
+        print(f"{'niveau':<20}{'tuiles':>8}{'avant (Ko)':>14}{'après (Ko)':>14}")
+        for path in paths:
+            count, before = measure(path, shared=False)
+            _, after = measure(path, shared=True)
+            total_before += before
+            total_after += after
+            print(f"{os.path.basename(path):<20}{count:>8}{before / 1024:>14.1f}{after / 1024:>14.1f}")
+        print(f"{'total':<20}{'':>8}{total_before / 1024:>14.1f}{total_after / 1024:>14.1f}")
+    finally:
+        objects.SHARED_TILE_IMAGES = previous_mode
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
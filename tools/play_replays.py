@@ -0,0 +1,67 @@
+"""
+Relecture headless des replays (.gdr, voir replay.py) : vérifie que chaque
+tentative enregistrée est reproduite à l'identique, et sert de charge de
+travail reproductible pour mesurer la simulation (--repeat).
+
+Usage (depuis la racine du projet) :
+    python -m tools.play_replays [--repeat 20] [replays/level1_....gdr ...]
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+import headless
+from replay import Replay, level_crc, play
+
+REPLAYS_DIR = "replays"
+LEVELS_DIR = "levels"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejoue les replays sans fenêtre")
+    parser.add_argument("replays", nargs="*")
+    parser.add_argument("--repeat", type=int, default=1, help="relectures par replay")
+    args = parser.parse_args()
+
+    paths = args.replays or sorted(glob.glob(os.path.join(REPLAYS_DIR, "*.gdr")))
+    if not paths:
+        print(f"❌ aucun replay dans {REPLAYS_DIR}/")
+        sys.exit(1)
+
+    levels = {}
+    failures = 0
+    for path in paths:
+        name = os.path.basename(path)
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError) as e:
+            failures += 1
+            print(f"❌ {name} : {e}")
+            continue
+
+        level_path = os.path.join(LEVELS_DIR, replay.level_name)
+        if level_crc(level_path) != replay.crc:
+            print(f"⚠ {name} : {replay.level_name} a changé depuis l'enregistrement")
+        level = levels.get(level_path)
+        if level is None:
+            level = levels[level_path] = headless.load_level(level_path)
+
+        start = time.perf_counter()
+        results = [play(level, replay) for _ in range(args.repeat)]
+        elapsed = time.perf_counter() - start
+
+        result = results[0]
+        ok = all(r == result for r in results) and result.identical
+        failures += not ok
+        tps = sum(r.ticks for r in results) / elapsed
+        status = "identique" if ok else f"divergent (enregistré : {replay.outcome} au tick {replay.ticks})"
+        print(f"{'✅' if ok else '❌'} {name} : {result.outcome} au tick {result.ticks}, "
+              f"{status} ({tps:.0f} ticks/s)")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Recherche automatique des sauts : trouve si un niveau est faisable, avec
+quels instants de saut, et mesure la fenêtre de tolérance de chaque saut.
+
+La recherche est un parcours en profondeur sur les décisions "maintenir
+ESPACE ou non", une décision toutes les DECISION_TICKS ticks (une frame à
+60 fps) : un appui dure donc une frame, comme un appui humain minimal.
+Les états déjà visités (x, y, vitesse, double saut, timers) sont mémorisés
+et élagués ; x est une fonction du tick, il remplace donc la colonne.
+Le travail est réparti sur un ProcessPoolExecutor : sous-arbres de la
+recherche, puis mesure des fenêtres de chaque saut.
+
+Score de difficulté : la plus petite fenêtre (en frames à 60 fps) pendant
+laquelle un saut de la solution peut être déclenché sans échouer.
+
+Usage (depuis la racine du projet) :
+    python -m tools.solver [--workers 4] [--max-nodes 50000] [--write-script] [levels/level1.json ...]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import headless
+from level import Level
+
+# Une décision par frame à 60 fps
+DECISION_TICKS = Level.SIM_HZ // 60
+
+# Décalage maximal testé pour mesurer la fenêtre d'un saut (en ticks)
+MAX_SHIFT = Level.SIM_HZ // 2
+
+# Nœuds explorés au plus par sous-arbre (un niveau sans arrivée ne finit jamais sinon)
+MAX_NODES = 50_000
+
+# Issues d'une avance de simulation
+ALIVE, DIED, COMPLETED = range(3)
+
+# Niveau chargé une seule fois par processus
+_LEVELS = {}
+
+
+def get_level(level_path):
+    """Level headless du processus courant (sans streaming : états restaurables)"""
+    level = _LEVELS.get(level_path)
+    if level is None:
+        level = headless.load_level(level_path, streaming=False)
+        _LEVELS[level_path] = level
+    return level
+
+
+def state_key(level):
+    """Tout ce qui décide de la suite de la simulation (hors rotation, visuelle)"""
+    p = level.player
+    return (p.pos_x_float, p.pos_y_float, p.vel_y, p.is_jumping, p.s_was_on_ground,
+            p.coyote_timer, p.jump_buffered, p.jump_buffer_timer,
+            p.can_double_jump, p.has_used_double_jump,
+            level.respawn_invincibility > 0,
+            sum(1 for orb in level.orbs if orb.collected))
+
+
+def held_ticks(presses):
+    """Ticks pendant lesquels ESPACE est maintenue (une frame par appui)"""
+    return {tick for start in presses for tick in range(start, start + DECISION_TICKS)}
+
+
+def advance(level, press, ticks):
+    """Avance de ticks pas, ESPACE maintenue pendant tout l'intervalle si press"""
+    for _ in range(ticks):
+        if press:
+            level.player.jump()
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_completed:
+            return COMPLETED
+        if is_dead:
+            return DIED
+    return ALIVE
+
+
+def replay(level, presses, until_tick):
+    """Rejoue depuis le début avec les appuis donnés jusqu'à until_tick"""
+    level.reset()
+    pressed = held_ticks(presses)
+    for tick in range(until_tick):
+        if tick in pressed:
+            level.player.jump()
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_completed:
+            return COMPLETED
+        if is_dead:
+            return DIED
+    return ALIVE
+
+
+def expand(level, state, tick):
+    """
+    Enfants d'un nœud de décision : [(appui, état, issue)], sans appui en
+    premier. L'appui est ignoré s'il ne change rien (pas de saut possible).
+    """
+    children = []
+    keys = []
+    for press in (False, True):
+        level.set_state(state)
+        outcome = advance(level, press, DECISION_TICKS)
+        key = state_key(level) if outcome == ALIVE else outcome
+        if key in keys:
+            continue
+        keys.append(key)
+        children.append((press, level.get_state() if outcome == ALIVE else None, outcome))
+    return children
+
+
+def search(level_path, prefix, start_tick, max_ticks, max_nodes=MAX_NODES):
+    """
+    Parcours en profondeur depuis le nœud atteint au tick start_tick avec
+    les appuis de prefix. Retourne (appuis de la solution ou None, vrai si
+    le budget de nœuds est épuisé).
+    """
+    level = get_level(level_path)
+    outcome = replay(level, prefix, start_tick)
+    if outcome == COMPLETED:
+        return list(prefix), False
+    if outcome == DIED:
+        return None, False
+
+    seen = set()
+    # Pile de (état, tick, appuis) ; appuis = liste chaînée (tick, parent)
+    links = None
+    for tick in prefix:
+        links = (tick, links)
+    stack = [(level.get_state(), start_tick, links)]
+
+    while stack:
+        state, tick, links = stack.pop()
+        if tick >= max_ticks:
+            continue
+        level.set_state(state)
+        key = state_key(level)
+        if key in seen:
+            continue
+        if len(seen) >= max_nodes:
+            return None, True
+        seen.add(key)
+
+        children = expand(level, state, tick)
+        # Empilés à l'envers : "ne pas sauter" est exploré en premier
+        for press, child_state, outcome in reversed(children):
+            child_links = (tick, links) if press else links
+            if outcome == COMPLETED:
+                presses = []
+                while child_links:
+                    presses.append(child_links[0])
+                    child_links = child_links[1]
+                return presses[::-1], False
+            if outcome == ALIVE:
+                stack.append((child_state, tick + DECISION_TICKS, child_links))
+
+    return None, False
+
+
+def split_frontier(level_path, count, max_ticks):
+    """
+    Découpe l'arbre de recherche en sous-arbres indépendants (parcours en
+    largeur jusqu'à count nœuds). Retourne [(appuis, tick)].
+    """
+    level = get_level(level_path)
+    level.reset()
+    frontier = [((), level.get_state(), 0)]
+    while 0 < len(frontier) < count:
+        next_frontier = []
+        for presses, state, tick in frontier:
+            if tick >= max_ticks:
+                continue
+            for press, child_state, outcome in expand(level, state, tick):
+                child = presses + (tick,) if press else presses
+                if outcome == COMPLETED:
+                    return [(child, tick + DECISION_TICKS)]
+                if outcome == ALIVE:
+                    next_frontier.append((child, child_state, tick + DECISION_TICKS))
+        frontier = next_frontier
+    return [(presses, tick) for presses, _, tick in frontier]
+
+
+def reference_run(level, presses, max_ticks):
+    """Trajectoire de la solution : (état, clé) à chaque tick"""
+    level.reset()
+    pressed = held_ticks(presses)
+    trajectory = []
+    for tick in range(max_ticks):
+        trajectory.append((level.get_state(), state_key(level)))
+        if tick in pressed:
+            level.player.jump()
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_completed or is_dead:
+            break
+    return trajectory
+
+
+def shifted_succeeds(level, trajectory, presses, index, shift, max_ticks):
+    """Vrai si la solution reste valide en décalant l'appui index de shift ticks"""
+    moved = presses[index] + shift
+    if moved < 0 or moved >= len(trajectory):
+        return False
+    if index > 0 and moved < presses[index - 1] + DECISION_TICKS:
+        return False
+    if index + 1 < len(presses) and moved + DECISION_TICKS > presses[index + 1]:
+        return False
+
+    new_presses = list(presses)
+    new_presses[index] = moved
+    new_presses = held_ticks(new_presses)
+
+    start = min(presses[index], moved)
+    level.set_state(trajectory[start][0])
+    for tick in range(start, max_ticks):
+        # Retour sur la trajectoire de référence : la suite est identique
+        if tick >= max(presses[index], moved) + DECISION_TICKS and tick < len(trajectory):
+            if state_key(level) == trajectory[tick][1]:
+                return True
+        if tick in new_presses:
+            level.player.jump()
+        is_dead, is_completed = level.update(Level.SIM_DT)
+        if is_completed:
+            return True
+        if is_dead:
+            return False
+    return False
+
+
+def measure_window(level_path, presses, index, max_ticks):
+    """Fenêtre [début, fin] (décalages en ticks) pendant laquelle l'appui index fonctionne"""
+    level = get_level(level_path)
+    trajectory = reference_run(level, presses, max_ticks)
+
+    low = 0
+    while low > -MAX_SHIFT and shifted_succeeds(level, trajectory, presses, index, low - 1, max_ticks):
+        low -= 1
+    high = 0
+    while high < MAX_SHIFT and shifted_succeeds(level, trajectory, presses, index, high + 1, max_ticks):
+        high += 1
+    return index, low, high
+
+
+def solve(level_path, pool, workers, max_nodes=MAX_NODES):
+    """
+    Cherche une solution en parallèle (déterministe : la première dans
+    l'ordre du parcours en profondeur). Retourne (appuis, fenêtres, budget
+    épuisé) ; appuis et fenêtres valent None sans solution.
+    """
+    max_ticks = headless.max_ticks_for(get_level(level_path))
+    prefixes = split_frontier(level_path, workers * 4, max_ticks)
+
+    # Résultats lus dans l'ordre des sous-arbres (celui du parcours en
+    # profondeur) : la première solution dans cet ordre, pas la plus rapide
+    # à trouver, pour un résultat identique à chaque lancement
+    solution = None
+    exhausted = False
+    futures = [pool.submit(search, level_path, prefix, tick, max_ticks, max_nodes)
+               for prefix, tick in prefixes]
+    for future in futures:
+        result, truncated = future.result()
+        exhausted = exhausted or truncated
+        if result is not None:
+            solution = result
+            break
+    for future in futures:
+        future.cancel()
+
+    if solution is None:
+        return None, None, exhausted
+
+    futures = [pool.submit(measure_window, level_path, solution, i, max_ticks)
+               for i in range(len(solution))]
+    windows = [None] * len(solution)
+    for future in as_completed(futures):
+        index, low, high = future.result()
+        windows[index] = (low, high)
+    return solution, windows, False
+
+
+def write_script(level_path, presses):
+    """Écrit le script d'entrées utilisé par tools.validate_levels"""
+    script_path = os.path.join("levels", "inputs", os.path.basename(level_path))
+    os.makedirs(os.path.dirname(script_path), exist_ok=True)
+    with open(script_path, "w") as f:
+        json.dump({"sim_hz": Level.SIM_HZ, "held": [[t, t + DECISION_TICKS] for t in presses]}, f)
+        f.write("\n")
+    return script_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cherche les sauts qui terminent chaque niveau")
+    parser.add_argument("levels", nargs="*")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-nodes", type=int, default=MAX_NODES,
+                        help="nœuds explorés au plus par sous-arbre de la recherche")
+    parser.add_argument("--write-script", action="store_true",
+                        help="écrit la solution dans levels/inputs/ (tools.validate_levels)")
+    args = parser.parse_args()
+
+    paths = args.levels or sorted(glob.glob(os.path.join("levels", "level*.json")))
+    ticks_per_frame = Level.SIM_HZ / 60
+    failures = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for path in paths:
+            start = time.perf_counter()
+            presses, windows, exhausted = solve(path, pool, args.workers, args.max_nodes)
+            elapsed = time.perf_counter() - start
+            name = os.path.basename(path)
+
+            if presses is None:
+                failures += 1
+                cause = "budget de nœuds épuisé" if exhausted else "aucune solution"
+                print(f"❌ {name} : {cause} ({elapsed:.1f} s)")
+                continue
+
+            sizes = [(high - low + 1) / ticks_per_frame for low, high in windows]
+            score = min(sizes) if sizes else float("inf")
+            print(f"✅ {name} : {len(presses)} sauts, fenêtre minimale {score:.2f} frames ({elapsed:.1f} s)")
+            for tick, (low, high), size in zip(presses, windows, sizes):
+                print(f"   tick {tick:>6} : [{low:+d}, {high:+d}] ticks -> {size:.2f} frames")
+
+            if args.write_script:
+                print(f"   script écrit : {write_script(path, presses)}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
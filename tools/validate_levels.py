@@ -0,0 +1,99 @@
+"""
+Validation des niveaux en simulation headless (pour la CI).
+
+Chaque levels/levelN.json est rejoué avec son script d'entrées
+levels/inputs/levelN.json (voir headless.py). Le niveau doit être terminé,
+et si le script contient un résultat attendu ("expect"), le nombre de ticks
+doit être identique : un écart signale une régression de la physique.
+
+Un niveau qu'aucun script ne peut terminer (pas de drapeau d'arrivée, comme
+le niveau de démonstration level2) est exclu explicitement : son script
+contient seulement {"skip": "raison"}, affichée sans faire échouer la CI.
+Un script absent reste une erreur.
+
+Débit : une tentative complète de level1 dure ~3450 ticks (240 Hz), soit
+40 à 60 tentatives/s (~150 000 ticks/s) sur une machine de dev. Le coût est
+celui de la physique pas à pas ; --repeat sert à le mesurer, pas à
+explorer des milliers de tentatives par seconde.
+
+Usage (depuis la racine du projet) :
+    python -m tools.validate_levels [--repeat 100] [--update] [levels/level1.json ...]
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+
+import headless
+
+INPUTS_DIR = os.path.join("levels", "inputs")
+
+
+def script_path_for(level_path):
+    return os.path.join(INPUTS_DIR, os.path.basename(level_path))
+
+
+def validate(level_path, repeat, update):
+    """Rejoue un niveau, retourne (ok, message, tentatives/s ou None si exclu)"""
+    script_path = script_path_for(level_path)
+    if not os.path.exists(script_path):
+        return False, f"pas de script d'entrées ({script_path})", 0.0
+
+    with open(script_path) as f:
+        script = json.load(f)
+    if "skip" in script:
+        return True, f"exclu : {script['skip']}", None
+
+    is_pressed = headless.load_script(script_path)
+    level = headless.load_level(level_path)
+
+    start = time.perf_counter()
+    results = {headless.run_attempt(level, is_pressed) for _ in range(repeat)}
+    rate = repeat / (time.perf_counter() - start)
+
+    # Simulation déterministe : toutes les répétitions doivent être identiques
+    if len(results) != 1:
+        return False, f"résultats non déterministes : {sorted(results)}", rate
+    result = results.pop()
+
+    if update:
+        script["expect"] = {"completed": result.completed, "ticks": result.ticks}
+        with open(script_path, "w") as f:
+            json.dump(script, f)
+            f.write("\n")
+
+    if not result.completed:
+        cause = "mort" if result.died else "bloqué"
+        return False, f"non terminé ({cause} au tick {result.ticks}, x={result.distance})", rate
+
+    expected = script.get("expect", {}).get("ticks")
+    if expected is not None and expected != result.ticks:
+        return False, f"terminé en {result.ticks} ticks, {expected} attendus (régression physique ?)", rate
+
+    return True, f"terminé en {result.ticks} ticks", rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valide les niveaux en simulation headless")
+    parser.add_argument("levels", nargs="*")
+    parser.add_argument("--repeat", type=int, default=1, help="tentatives simulées par niveau")
+    parser.add_argument("--update", action="store_true", help="réécrit les résultats attendus")
+    args = parser.parse_args()
+
+    paths = args.levels or sorted(glob.glob(os.path.join("levels", "level*.json")))
+    failures = 0
+    for path in paths:
+        ok, message, rate = validate(path, args.repeat, args.update)
+        failures += not ok
+        if rate is None:
+            print(f"⏭️  {os.path.basename(path)} : {message}")
+        else:
+            print(f"{'✅' if ok else '❌'} {os.path.basename(path)} : {message} ({rate:.0f} tentatives/s)")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()